@@ -1,7 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, DateTime, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 class ActivityLog(SQLModel, table=True):
@@ -11,5 +12,5 @@ class ActivityLog(SQLModel, table=True):
     action: str
     entity_type: str  # lead, campaign, system
     entity_id: Optional[uuid.UUID] = None
-    meta_data: Dict[str, Any] = Field(default={}, sa_type=JSONB)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    meta_data: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=DateTime(timezone=True))
@@ -1,12 +1,24 @@
 from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
 from backend.services.apify_service import apify_service
+from backend.models.lead import Lead, LeadInteraction
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from itertools import product
+from typing import Dict, Any, List, Optional
+from sqlalchemy import func, insert, literal, literal_column, text, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 import logging
+import orjson
 
 router = APIRouter(prefix="/ingest/apify", tags=["Apify Integration"])
 logger = logging.getLogger(__name__)
 
+# Items upserted and committed per batch while ingesting a dataset
+INGEST_CHUNK_SIZE = 5000
+# Lead rows per multi-VALUES upsert; ~20 bind params per row keeps each
+# statement well under asyncpg's 32767-parameter limit
+UPSERT_PAGE_SIZE = 1000
+
 class ScrapeRequest(BaseModel):
     actor_id: str
     run_input: Dict[str, Any]
@@ -19,7 +31,7 @@ async def trigger_scrape(request: ScrapeRequest):
     - LinkedIn: 'curious_programmer/linkedin-profile-scraper'
     - Google Maps: 'compass/google-maps-scraper'
     """
-    result = apify_service.run_actor(request.actor_id, request.run_input)
+    result = await apify_service.run_actor(request.actor_id, request.run_input)
     if not result["success"]:
         raise HTTPException(status_code=500, detail=result["error"])
     return result
@@ -30,7 +42,7 @@ async def apify_webhook(request: Request, background_tasks: BackgroundTasks):
     Webhook endpoint called by Apify when a run completes.
     Payload typically contains {"eventType": "ACTOR.RUN.SUCCEEDED", "resource": {...}}
     """
-    payload = await request.json()
+    payload = orjson.loads(await request.body())
     logger.info(f"Received Apify webhook: {payload}")
     
     event_type = payload.get("eventType")
@@ -44,147 +56,253 @@ async def apify_webhook(request: Request, background_tasks: BackgroundTasks):
     
     return {"status": "received"}
 
+def _classify_interaction(has_text: bool, has_reaction: bool, is_post: bool, has_post_content: bool) -> str:
+    """Map the shape of an Apify item to the interaction it represents."""
+    # 'text' usually implies a comment. 'reactionType' implies a reaction.
+    if has_text and not is_post: # It's likely a comment
+        return "comment"
+    if has_reaction:
+        return "reaction"
+    if is_post or has_post_content: # It's the post author
+        return "post_author"
+    return "profile_visit" # Default fallback for just a profile scrape
+
+# Every combination precomputed once, so classifying an item is a single dict lookup
+INTERACTION_TYPES = {
+    key: _classify_interaction(*key) for key in product((False, True), repeat=4)
+}
+
+# Meaningful interactions worth recording (not just a profile scrape of a static list)
+RECORDED_INTERACTIONS = frozenset({"comment", "reaction", "post_author"})
+
+# Fallback chains for fields different actors name differently, in priority order
+URL_KEYS = ("authorProfileUrl", "profileUrl", "url", "linkedInUrl")
+NAME_KEYS = ("authorFullName", "fullName", "name", "title")
+TITLE_KEYS = ("authorHeadline", "headline", "subTitle")
+CONTENT_KEYS = ("text", "postContent")
+SOURCE_URL_KEYS = ("url", "permalink")
+
+def _first(item: Dict[str, Any], keys: tuple) -> Optional[Any]:
+    """Return the first truthy value among keys, or None."""
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return None
+
+def _upsert_leads_statement(rows: List[Dict[str, Any]]):
+    """
+    Build an INSERT ... ON CONFLICT (campaign_id, linkedin_url) DO UPDATE for Apify leads.
+    Existing leads keep their title unless empty and merge the new profile payload
+    into the stored one server-side (JSONB ||).
+    Returns (id, linkedin_url, inserted) for every row so interactions can be linked.
+    """
+    stmt = pg_insert(Lead).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["campaign_id", "linkedin_url"],
+        set_={
+            "profile_data": func.coalesce(Lead.profile_data, literal({}, JSONB)).op("||", return_type=JSONB)(
+                stmt.excluded.profile_data
+            ),
+            "title": func.coalesce(func.nullif(Lead.title, ""), stmt.excluded.title),
+            "updated_at": stmt.excluded.updated_at
+        }
+    )
+    # xmax is 0 only for freshly inserted tuples, which lets us count new leads
+    return stmt.returning(Lead.id, Lead.linkedin_url, literal_column("xmax = 0").label("inserted"))
+
+async def _ingest_items(session, campaign, items: List[Dict[str, Any]]) -> int:
+    """
+    Upsert leads and record interactions for one chunk of Apify items.
+    Returns the number of newly created leads.
+    """
+    # Leads are collected as plain rows (deduplicated by URL, since
+    # one upsert cannot touch the same row twice) and written with
+    # INSERT ... ON CONFLICT per UPSERT_PAGE_SIZE rows after the loop
+    # Each chunk is its own transaction. Ingest is replayable from the Apify
+    # dataset, so skip the WAL flush wait on commit; SET LOCAL keeps this
+    # scoped to this transaction and user-facing writes stay fully durable.
+    await session.execute(text("SET LOCAL synchronous_commit = OFF"))
+    
+    lead_rows = {}
+    new_interactions = []
+    # One timestamp for the whole chunk instead of a default call per row.
+    # lead/lead_interaction columns are still naive, so store it as naive UTC.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    # Read once; instrumented ORM attributes are comparatively slow per access
+    org_id, campaign_id = campaign.org_id, campaign.id
+    
+    for item in items:
+        # 1. IDENTIFY THE PERSON
+        linkedin_url = _first(item, URL_KEYS)
+        
+        if not linkedin_url:
+            continue
+
+        # 2. DETERMINE INTERACTION TYPE
+        interaction_type = INTERACTION_TYPES[(
+            "text" in item,
+            "reactionType" in item,
+            item.get("type") == "Post",
+            "postContent" in item
+        )]
+
+        # 3. UPSERT LEAD (Save Everything)
+        title = _first(item, TITLE_KEYS)
+
+        row = lead_rows.get(linkedin_url)
+        if row:
+            # Same person seen earlier in this chunk
+            # Merge logic: newer keys win, nothing already scraped is lost
+            row["profile_data"] = {**row["profile_data"], **item}
+            if title and not row["title"]:
+                row["title"] = title
+        else:
+            lead_rows[linkedin_url] = {
+                "org_id": org_id,
+                "campaign_id": campaign_id,
+                "name": _first(item, NAME_KEYS) or "Unknown Lead",
+                "linkedin_url": linkedin_url,
+                "title": title,
+                "source": "apify_cloud",
+                "status": "new",
+                "phone_numbers": [],
+                "tags": [],
+                "custom_fields": {},
+                "profile_data": item, # SAVE EVERYTHING: Full parsed item
+                "created_at": now,
+                "updated_at": now
+            }
+
+        # 4. RECORD INTERACTION (The Signal)
+        if interaction_type in RECORDED_INTERACTIONS:
+            content = _first(item, CONTENT_KEYS)
+            source_url = _first(item, SOURCE_URL_KEYS)
+            
+            new_interactions.append((linkedin_url, {
+                "campaign_id": campaign_id,
+                "type": interaction_type,
+                "content": content,
+                "source_url": source_url,
+                "raw_data": item, # SAVE EVERYTHING: The specific event data
+                "created_at": now
+            }))
+
+    lead_ids = {}
+    new_leads_count = 0
+    rows = list(lead_rows.values())
+    for start in range(0, len(rows), UPSERT_PAGE_SIZE):
+        result = await session.execute(
+            _upsert_leads_statement(rows[start:start + UPSERT_PAGE_SIZE])
+        )
+        for row in result:
+            lead_ids[row.linkedin_url] = row.id
+            new_leads_count += row.inserted
+    
+    if new_interactions:
+        await session.execute(
+            insert(LeadInteraction),
+            [
+                {**interaction, "lead_id": lead_ids[url]}
+                for url, interaction in new_interactions
+            ]
+        )
+    
+    return new_leads_count
+
 async def process_apify_dataset(dataset_id: str, run_id: str):
     """
     Background task to fetch and process data from Apify.
+    Items are streamed page by page and ingested in chunks of INGEST_CHUNK_SIZE,
+    so memory stays bounded regardless of dataset size.
+    Each chunk commits together with the campaign's lead count and the run's
+    progress (result_data["items_processed"]), so a redelivered webhook after
+    a failure resumes after the last committed chunk instead of re-ingesting it.
     """
     logger.info(f"Processing dataset {dataset_id} for run {run_id}")
-    items = apify_service.get_dataset_items(dataset_id)
-    logger.info(f"Retrieved {len(items)} items from Apify run {run_id}")
     
-    # Save to CampaignRun
-    from backend.database import get_session
+    from backend.database import async_session_maker
     from backend.campaigns.run_models import CampaignRun
+    from backend.models.campaign import Campaign
     from sqlmodel import select
-    from datetime import datetime
 
-    session_gen = get_session()
-    session = next(session_gen)
+    session = async_session_maker()
     
     try:
         statement = select(CampaignRun).where(CampaignRun.apify_run_id == run_id)
-        run_record = session.exec(statement).first()
+        run_record = (await session.exec(statement)).first()
         
-        if run_record:
-            run_record.result_data = {"items": items}
-            run_record.status = "completed"
-            run_record.completed_at = datetime.utcnow()
-            session.add(run_record)
-            session.commit()
-            logger.info(f"Saved execution data for run {run_id}")
-            
-            # Update Campaign status as well
-            if run_record.campaign_id:
-                # Need to import Campaign to update it
-                from backend.models.campaign import Campaign
-                from backend.models.lead import Lead, LeadInteraction
-                
-                campaign = session.get(Campaign, run_record.campaign_id)
-                if campaign:
-                    # Process items to create Leads and Interactions
-                    new_leads_count = 0
-                    
-                    for item in items:
-                        # 1. IDENTIFY THE PERSON
-                        linkedin_url = (
-                            item.get("authorProfileUrl") or 
-                            item.get("profileUrl") or 
-                            item.get("url") or
-                            item.get("linkedInUrl")
-                        )
-                        
-                        if not linkedin_url:
-                            continue
-
-                        # 2. DETERMINE INTERACTION TYPE
-                        # 'text' usually implies a comment. 'reactionType' implies a reaction.
-                        interaction_type = "unknown"
-                        if "text" in item and item.get("type") != "Post": # It's likely a comment
-                            interaction_type = "comment"
-                        elif "reactionType" in item:
-                            interaction_type = "reaction"
-                        elif item.get("type") == "Post" or "postContent" in item: # It's the post author
-                            interaction_type = "post_author"
-                        else:
-                            interaction_type = "profile_visit" # Default fallback for just a profile scrape
-
-                        # 3. UPSERT LEAD (Save Everything)
-                        # Check if lead already exists
-                        lead = session.exec(
-                            select(Lead).where(
-                                Lead.campaign_id == campaign.id,
-                                Lead.linkedin_url == linkedin_url
-                            )
-                        ).first()
-
-                        name = (
-                            item.get("authorFullName") or 
-                            item.get("fullName") or 
-                            item.get("name") or 
-                            item.get("title") or 
-                            "Unknown Lead"
-                        )
-                        
-                        title = (
-                            item.get("authorHeadline") or 
-                            item.get("headline") or 
-                            item.get("subTitle")
-                        )
-
-                        if not lead:
-                            lead = Lead(
-                                org_id=campaign.org_id,
-                                campaign_id=campaign.id,
-                                name=name,
-                                linkedin_url=linkedin_url,
-                                title=title,
-                                source="apify_cloud",
-                                status="new",
-                                profile_data=item # SAVE EVERYTHING: Full parsed item
-                            )
-                            session.add(lead)
-                            new_leads_count += 1
-                        else:
-                            # Update existing lead with new enriched data if available
-                            # Merge logic: favor new non-empty data
-                            if len(str(item)) > len(str(lead.profile_data or "")):
-                                lead.profile_data = item
-                            if title and not lead.title:
-                                lead.title = title
-                            session.add(lead)
-                        
-                        # Flush to get lead.id
-                        session.flush()
-
-                        # 4. RECORD INTERACTION (The Signal)
-                        # Only record if it's a meaningful interaction (not just a profile scrape of a static list)
-                        if interaction_type in ["comment", "reaction", "post_author"]:
-                            content = item.get("text") or item.get("postContent")
-                            source_url = item.get("url") or item.get("permalink")
-                            
-                            interaction = LeadInteraction(
-                                lead_id=lead.id,
-                                campaign_id=campaign.id,
-                                type=interaction_type,
-                                content=content,
-                                source_url=source_url,
-                                raw_data=item # SAVE EVERYTHING: The specific event data
-                            )
-                            session.add(interaction)
-
-                    # Update campaign stats
-                    campaign.leads_count += new_leads_count
-                    if campaign.status != "completed":
-                        campaign.status = "active"
-                    
-                    session.add(campaign)
-                    session.commit()
-                    logger.info(f"Created {new_leads_count} new leads for campaign {campaign.id}")
-
-        else:
+        if not run_record:
             logger.warning(f"No CampaignRun found for run_id {run_id}")
+            return
+        
+        if run_record.status == "completed":
+            # Duplicate webhook delivery for a run we already ingested
+            logger.info(f"Run {run_id} already processed, skipping")
+            return
+        
+        campaign = None
+        if run_record.campaign_id:
+            campaign = await session.get(Campaign, run_record.campaign_id)
+        
+        # Resume after the chunks an earlier attempt already committed
+        progress = run_record.result_data or {}
+        processed = progress.get("items_processed", 0) if progress.get("dataset_id") == dataset_id else 0
+        if processed:
+            logger.info(f"Resuming run {run_id} after {processed} committed items")
+        
+        async def commit_chunk(chunk: List[Dict[str, Any]]) -> int:
+            nonlocal processed
+            new_leads = await _ingest_items(session, campaign, chunk) if campaign else 0
+            if new_leads:
+                await session.execute(
+                    update(Campaign)
+                    .where(Campaign.id == campaign.id)
+                    .values(leads_count=Campaign.leads_count + new_leads)
+                )
+            processed += len(chunk)
+            run_record.result_data = {"dataset_id": dataset_id, "items_processed": processed}
+            session.add(run_record)
+            await session.commit()
+            return new_leads
+        
+        new_leads_count = 0
+        chunk = []
+        async for item in apify_service.iter_dataset_items(dataset_id, offset=processed):
+            chunk.append(item)
+            if len(chunk) >= INGEST_CHUNK_SIZE:
+                new_leads_count += await commit_chunk(chunk)
+                chunk = []
+        
+        if chunk:
+            new_leads_count += await commit_chunk(chunk)
+        
+        logger.info(f"Retrieved {processed} items from Apify run {run_id}")
+        
+        # Raw items already live on the leads/interactions; keep only a summary on the run
+        run_record.result_data = {"dataset_id": dataset_id, "item_count": processed}
+        run_record.status = "completed"
+        run_record.completed_at = datetime.now(timezone.utc)
+        session.add(run_record)
+        
+        if campaign and campaign.status != "completed":
+            campaign.status = "active"
+            session.add(campaign)
+        
+        await session.commit()
+        logger.info(f"Saved execution data for run {run_id}")
+        if campaign:
+            logger.info(f"Created {new_leads_count} new leads for campaign {campaign.id}")
             
     except Exception as e:
         logger.error(f"Error saving run results: {e}")
+        # Committed chunks and their progress stay; a redelivery resumes from there
+        await session.rollback()
+        await session.execute(
+            update(CampaignRun)
+            .where(CampaignRun.apify_run_id == run_id)
+            .values(status="failed")
+        )
+        await session.commit()
     finally:
-        session.close()
+        await session.close()
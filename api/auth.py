@@ -13,7 +13,8 @@ from backend.schemas.auth import (
     EmailVerificationRequest, ResendVerificationRequest
 )
 from backend.schemas.common import MessageResponse
-from backend.api.deps import get_current_user, get_client_info
+from backend.api.deps import get_current_user, get_client_info, forget_user_tokens
+from backend.core.security import verify_token
 from backend.models.user import User
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -83,6 +84,11 @@ async def logout(
     """Logout by revoking refresh token."""
     auth_service = AuthService(session)
     await auth_service.logout(request.refresh_token)
+    
+    payload = verify_token(request.refresh_token, "refresh")
+    if payload and payload.get("user_id"):
+        forget_user_tokens(payload["user_id"])
+    
     return MessageResponse(message="Logged out successfully")
 
 
@@ -94,6 +100,7 @@ async def logout_all(
     """Logout from all devices."""
     auth_service = AuthService(session)
     count = await auth_service.logout_all(current_user.id)
+    forget_user_tokens(current_user.id)
     return MessageResponse(message=f"Logged out from {count} devices")
 
 
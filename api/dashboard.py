@@ -1,12 +1,14 @@
 """
 Dashboard API routes.
 """
+import asyncio
+import uuid
 from fastapi import APIRouter, Depends, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import func, select
 from datetime import datetime, timedelta
 
-from backend.database import get_session
+from backend.database import get_session, async_session_maker
 from backend.services.activity_service import ActivityService
 from backend.services.lead_service import LeadService
 from backend.repositories.campaign_repo import CampaignRepository
@@ -19,25 +21,35 @@ from backend.models.campaign import Campaign
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
+async def _get_lead_stats(org_id: uuid.UUID) -> dict:
+    async with async_session_maker() as session:
+        return await LeadService(session).get_stats(org_id)
+
+
+async def _count_active_campaigns(org_id: uuid.UUID) -> int:
+    async with async_session_maker() as session:
+        return await CampaignRepository(session).count_by_status(org_id, "active")
+
+
+async def _count_messages_by_status(org_id: uuid.UUID) -> dict:
+    async with async_session_maker() as session:
+        return await OutreachMessageRepository(session).count_by_status(org_id)
+
+
 @router.get("/stats")
 async def get_dashboard_stats(
-    current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session)
+    current_user: User = Depends(get_current_user)
 ):
     """Get dashboard statistics."""
     org_id = current_user.current_org_id
     
-    # Lead stats
-    lead_service = LeadService(session)
-    lead_stats = await lead_service.get_stats(org_id)
-    
-    # Campaign stats
-    campaign_repo = CampaignRepository(session)
-    active_campaigns = await campaign_repo.count_by_status(org_id, "active")
-    
-    # Outreach stats
-    outreach_repo = OutreachMessageRepository(session)
-    message_counts = await outreach_repo.count_by_status(org_id)
+    # Lead, campaign and outreach stats are independent, so run them
+    # concurrently, each on its own session (a session can't be shared)
+    lead_stats, active_campaigns, message_counts = await asyncio.gather(
+        _get_lead_stats(org_id),
+        _count_active_campaigns(org_id),
+        _count_messages_by_status(org_id)
+    )
     
     # Calculate response rate
     sent = message_counts.get("sent", 0) + message_counts.get("delivered", 0)
@@ -97,21 +109,10 @@ async def get_chart_data(
     rows = result.all()
     
     # Build labels and data
-    labels = []
-    data = []
-    
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        date_str = date.strftime("%a")  # Mon, Tue, etc.
-        labels.append(date_str)
-        
-        # Find count for this date
-        count = 0
-        for row in rows:
-            if row.date == date.date():
-                count = row.count
-                break
-        data.append(count)
+    counts = {row.date: row.count for row in rows}
+    dates = [start_date + timedelta(days=i) for i in range(days)]
+    labels = [date.strftime("%a") for date in dates]  # Mon, Tue, etc.
+    data = [counts.get(date.date(), 0) for date in dates]
     
     return {
         "labels": labels,
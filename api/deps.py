@@ -2,38 +2,173 @@
 API dependencies - shared across all routes.
 """
 import uuid
+import time
+import hashlib
+from datetime import datetime
 from typing import Optional
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import and_, bindparam
+from sqlalchemy.orm import defer, make_transient_to_detached
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.database import get_session
 from backend.config import settings
-from backend.core.security import verify_token
+from backend.core.security import verify_token, hash_token
 from backend.core.exceptions import raise_unauthorized
-from backend.models.user import User
-from backend.repositories.user_repo import UserRepository
+from backend.core.cache import cache_get, cache_set
+from backend.models.user import User, OrganizationMember
+from backend.models.token import ExtensionToken
+from backend.repositories.user_repo import user_cache_key, USER_CACHE_TTL
+from backend.repositories.token_repo import extension_token_cache_key, EXTENSION_TOKEN_CACHE_TTL
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/login")
 
+# Verified access tokens: sha256(token) -> (user_id, exp).
+# Keyed by digest so raw tokens are never kept in memory.
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+# Columns kept for a cached user (see _load_user)
+_CACHED_USER_FIELDS = tuple(
+    column.key for column in User.__table__.columns if column.key != "password_hash"
+)
+
+# Built once at import; SQLAlchemy's compiled cache then reuses the SQL on every request.
+# password_hash is never read off the current user, so it is not fetched.
+# The role in the current org comes along so /users/me needs no second query.
+_USER_BY_ID = (
+    select(User, OrganizationMember.role)
+    .outerjoin(
+        OrganizationMember,
+        and_(
+            OrganizationMember.user_id == User.id,
+            OrganizationMember.org_id == User.current_org_id
+        )
+    )
+    .options(defer(User.password_hash))
+    .where(User.id == bindparam("user_id"))
+)
+
+
+async def _load_user(session: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    """
+    Load a user by id, from the shared cache when possible.
+    Users are only cached in Redis: the in-process fallback is per worker,
+    so an invalidation in one worker would leave stale users in the others.
+    A cached user is attached to the session as persistent without a
+    SELECT, so endpoints can still modify and commit it. The user's role
+    in its current org is set as user._cached_role.
+    """
+    cache_key = user_cache_key(user_id)
+    data = await cache_get(cache_key) if settings.REDIS_URL else None
+    
+    if data is not None:
+        role = data["role"]
+        # password_hash is never cached; validate with a placeholder, then
+        # expire it so anything that needs it reloads it from the database
+        fields = {field: data[field] for field in _CACHED_USER_FIELDS}
+        user = User.model_validate({**fields, "password_hash": ""})
+        make_transient_to_detached(user)
+        session.add(user)
+        session.expire(user, ["password_hash"])
+        user._cached_role = role
+        return user
+    
+    result = await session.exec(_USER_BY_ID, params={"user_id": user_id})
+    row = result.first()
+    if not row:
+        return None
+    
+    user, role = row
+    user._cached_role = role
+    if settings.REDIS_URL:
+        data = {field: getattr(user, field) for field in _CACHED_USER_FIELDS}
+        data["role"] = role
+        await cache_set(cache_key, data, USER_CACHE_TTL)
+    return user
+
+
+def forget_user_tokens(user_id: uuid.UUID) -> None:
+    """Drop cached token verifications for a user (e.g. on logout)."""
+    user_id = str(user_id)
+    for key, (cached_user_id, _) in list(_token_cache.items()):
+        if cached_user_id == user_id:
+            _token_cache.pop(key, None)
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
     session: AsyncSession = Depends(get_session)
 ) -> User:
     """Get current authenticated user from JWT token."""
-    payload = verify_token(token, "access")
-    if not payload:
-        raise_unauthorized("Could not validate credentials")
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = _token_cache.get(cache_key)
+    
+    if cached and cached[1] > time.time():
+        user_id = cached[0]
+    else:
+        # Cache misses verify off the event loop so concurrent logins don't serialize
+        payload = await run_in_threadpool(verify_token, token, "access")
+        if not payload:
+            raise_unauthorized("Could not validate credentials")
+        
+        user_id = payload.get("user_id")
+        if not user_id:
+            raise_unauthorized("Could not validate credentials")
+        
+        _token_cache[cache_key] = (user_id, payload["exp"])
+    
+    user = await _load_user(session, uuid.UUID(user_id))
+    
+    if not user:
+        raise_unauthorized("User not found")
+    
+    if not user.is_active:
+        raise_unauthorized("User account is deactivated")
+    
+    return user
+
+
+async def get_extension_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_session)
+) -> User:
+    """
+    Get the user for Chrome extension calls.
+    Accepts a stored extension token (see /api/extension/auth) or a regular access token.
+    """
+    if token.count(".") == 2:
+        # header.payload.signature: a JWT access token, never an extension token
+        return await get_current_user(token, session)
+    
+    token_hash = hash_token(token)
+    cache_key = extension_token_cache_key(token_hash)
+    user_id = await cache_get(cache_key)
+    
+    if user_id is None:
+        result = await session.exec(
+            select(ExtensionToken.user_id, ExtensionToken.expires_at)
+            .where(ExtensionToken.token_hash == token_hash)
+        )
+        row = result.first()
+        now = datetime.utcnow()
+        if row and row.expires_at > now:
+            user_id = str(row.user_id)
+            ttl = min(int((row.expires_at - now).total_seconds()), EXTENSION_TOKEN_CACHE_TTL)
+            # Under a second left: Redis rejects ex=0, and the entry would be useless
+            if ttl >= 1:
+                await cache_set(cache_key, user_id, ttl)
     
-    user_id = payload.get("user_id")
-    if not user_id:
-        raise_unauthorized("Could not validate credentials")
+    if user_id is None:
+        # Not an extension token; fall back to JWT access tokens
+        return await get_current_user(token, session)
     
-    user_repo = UserRepository(session)
-    user = await user_repo.get(uuid.UUID(user_id))
+    user = await _load_user(session, uuid.UUID(user_id))
     
     if not user:
         raise_unauthorized("User not found")
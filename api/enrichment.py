@@ -1,24 +1,33 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import logging
 import uuid
 from datetime import datetime
-from sqlmodel import Session, select
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from backend.services.apollo_service import apollo_service
+from backend.services.apollo_service import apollo_service, split_name
+from backend.services.task_queue import broker, publish_enrich_lead, publish_bulk_enrich
 from backend.models.lead import Lead
-from backend.database import engine
+from backend.database import get_session, async_session_maker
 from backend.config import settings
 
 router = APIRouter(prefix="/enrichment", tags=["Enrichment"])
 logger = logging.getLogger(__name__)
 
+# Apollo's bulk_match accepts at most 10 people per request
+APOLLO_BULK_SIZE = 10
+# Leads accepted per bulk endpoint call (split into concurrent Apollo requests)
+MAX_BULK_LEADS = 100
+
 class EnrichRequest(BaseModel):
     lead_id: str  # UUID as string
 
 class BulkEnrichRequest(BaseModel):
-    lead_ids: List[str]  # Max 10
+    lead_ids: List[str]  # Max MAX_BULK_LEADS
 
 @router.post("/apollo/single")
 async def enrich_single_lead(request: EnrichRequest, background_tasks: BackgroundTasks):
@@ -29,8 +38,11 @@ async def enrich_single_lead(request: EnrichRequest, background_tasks: Backgroun
     try:
         lead_uuid = uuid.UUID(request.lead_id)
         
-        # Queue enrichment as background task
-        background_tasks.add_task(_enrich_lead_task, lead_uuid)
+        # Hand off to the worker queue, or run in-process when no queue is configured
+        if broker:
+            await publish_enrich_lead(lead_uuid)
+        else:
+            background_tasks.add_task(_enrich_lead_task, lead_uuid)
         
         return {
             "status": "queued",
@@ -44,15 +56,18 @@ async def enrich_single_lead(request: EnrichRequest, background_tasks: Backgroun
 @router.post("/apollo/bulk")
 async def enrich_bulk_leads(request: BulkEnrichRequest, background_tasks: BackgroundTasks):
     """
-    Enrich up to 10 leads using Apollo.io bulk API.
+    Enrich up to MAX_BULK_LEADS leads using Apollo.io bulk API.
     """
-    if len(request.lead_ids) > 10:
-        raise HTTPException(status_code=400, detail="Maximum 10 leads per bulk request")
+    if len(request.lead_ids) > MAX_BULK_LEADS:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BULK_LEADS} leads per bulk request")
     
     try:
         lead_uuids = [uuid.UUID(lid) for lid in request.lead_ids]
         
-        background_tasks.add_task(_bulk_enrich_task, lead_uuids)
+        if broker:
+            await publish_bulk_enrich(lead_uuids)
+        else:
+            background_tasks.add_task(_bulk_enrich_task, lead_uuids)
         
         return {
             "status": "queued",
@@ -64,52 +79,52 @@ async def enrich_bulk_leads(request: BulkEnrichRequest, background_tasks: Backgr
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status/{lead_id}")
-async def get_enrichment_status(lead_id: str):
+async def get_enrichment_status(lead_id: str, session: AsyncSession = Depends(get_session)):
     """
     Get enrichment status for a lead.
     """
     try:
         lead_uuid = uuid.UUID(lead_id)
         
-        with Session(engine) as session:
-            lead = session.get(Lead, lead_uuid)
-            
-            if not lead:
-                raise HTTPException(status_code=404, detail="Lead not found")
-            
-            return {
-                "lead_id": str(lead.id),
-                "enrichment_status": lead.enrichment_status,
-                "apollo_enriched_at": lead.apollo_enriched_at.isoformat() if lead.apollo_enriched_at else None,
-                "apollo_confidence": lead.apollo_match_confidence,
-                "has_email": bool(lead.email),
-                "has_phone": bool(lead.mobile_phone or lead.phone_numbers),
-                "credits_used": lead.apollo_credits_used
-            }
+        lead = await session.get(Lead, lead_uuid)
+        
+        if not lead:
+            raise HTTPException(status_code=404, detail="Lead not found")
+        
+        return {
+            "lead_id": str(lead.id),
+            "enrichment_status": lead.enrichment_status,
+            "apollo_enriched_at": lead.apollo_enriched_at.isoformat() if lead.apollo_enriched_at else None,
+            "apollo_confidence": lead.apollo_match_confidence,
+            "has_email": bool(lead.email),
+            "has_phone": bool(lead.mobile_phone or lead.phone_numbers),
+            "credits_used": lead.apollo_credits_used
+        }
     except Exception as e:
         logger.error(f"Failed to get status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Background tasks
 
-def _enrich_lead_task(lead_id: uuid.UUID):
+async def _enrich_lead_task(lead_id: uuid.UUID):
     """
     Background task to enrich a single lead.
     """
     try:
-        with Session(engine) as session:
-            lead = session.get(Lead, lead_id)
+        async with async_session_maker() as session:
+            lead = await session.get(Lead, lead_id)
             
             if not lead:
                 logger.error(f"Lead {lead_id} not found for enrichment")
                 return
             
             # Call Apollo API
-            result = apollo_service.enrich_person(
+            first_name, last_name = split_name(lead.name)
+            result = await apollo_service.enrich_person(
                 linkedin_url=lead.linkedin_url,
                 email=lead.email,
-                first_name=lead.name.split()[0] if lead.name else None,
-                last_name=" ".join(lead.name.split()[1:]) if lead.name and len(lead.name.split()) > 1 else None,
+                first_name=first_name,
+                last_name=last_name,
                 company_name=lead.company
             )
             
@@ -145,8 +160,9 @@ def _enrich_lead_task(lead_id: uuid.UUID):
                 
                 # Update enrichment metadata
                 lead.enrichment_status = "enriched"
-                lead.enriched_at = datetime.utcnow()
-                lead.apollo_enriched_at = datetime.utcnow()
+                now = datetime.utcnow()
+                lead.enriched_at = now
+                lead.apollo_enriched_at = now
                 lead.apollo_match_confidence = contact_info["confidence"]
                 lead.apollo_credits_used += result.get("credits_used", 1)
                 
@@ -157,77 +173,92 @@ def _enrich_lead_task(lead_id: uuid.UUID):
                 logger.warning(f"Apollo enrichment failed for lead {lead_id}: {result.get('error')}")
             
             session.add(lead)
-            session.commit()
+            await session.commit()
     
     except Exception as e:
         logger.error(f"Enrichment task failed for lead {lead_id}: {str(e)}")
 
-def _bulk_enrich_task(lead_ids: List[uuid.UUID]):
+def _apollo_person(lead: Lead) -> dict:
+    """Identifiers for one lead in an Apollo bulk match request."""
+    person = {}
+    if lead.linkedin_url:
+        person["linkedin_url"] = lead.linkedin_url
+    if lead.email:
+        person["email"] = lead.email
+    first_name, last_name = split_name(lead.name)
+    if first_name:
+        person["first_name"] = first_name
+    if last_name:
+        person["last_name"] = last_name
+    if lead.company:
+        person["organization_name"] = lead.company
+    return person
+
+async def _bulk_enrich_task(lead_ids: List[uuid.UUID]):
     """
     Background task to bulk enrich leads.
     """
     try:
-        with Session(engine) as session:
-            leads = session.exec(
+        async with async_session_maker() as session:
+            leads = (await session.exec(
                 select(Lead).where(Lead.id.in_(lead_ids))
-            ).all()
+            )).all()
             
             if not leads:
                 logger.error("No leads found for bulk enrichment")
                 return
             
-            # Build bulk request
-            people = []
-            for lead in leads:
-                person = {}
-                if lead.linkedin_url:
-                    person["linkedin_url"] = lead.linkedin_url
-                if lead.email:
-                    person["email"] = lead.email
-                if lead.name:
-                    name_parts = lead.name.split()
-                    person["first_name"] = name_parts[0]
-                    if len(name_parts) > 1:
-                        person["last_name"] = " ".join(name_parts[1:])
-                if lead.company:
-                    person["organization_name"] = lead.company
-                
-                people.append(person)
+            # Apollo matches at most APOLLO_BULK_SIZE people per call; send the chunks concurrently
+            chunks = [
+                leads[i:i + APOLLO_BULK_SIZE]
+                for i in range(0, len(leads), APOLLO_BULK_SIZE)
+            ]
+            results = await asyncio.gather(*(
+                apollo_service.bulk_enrich([_apollo_person(lead) for lead in chunk])
+                for chunk in chunks
+            ))
             
-            # Call Apollo bulk API
-            result = apollo_service.bulk_enrich(people)
+            now = datetime.utcnow()
             
-            if result["success"]:
+            # Collect per-lead changes and write them in one bulk UPDATE by primary key
+            updates = []
+            matched = 0
+            for chunk, result in zip(chunks, results):
+                if not result["success"]:
+                    logger.error(f"Apollo bulk enrichment failed: {result.get('error')}")
+                    continue
+                
                 matches = result["matches"]
-                credits_per_lead = result["credits_used"] // len(leads) if leads else 0
+                matched += len(matches)
+                credits_per_lead = result["credits_used"] // len(chunk)
                 
-                for idx, lead in enumerate(leads):
-                    if idx < len(matches):
-                        match = matches[idx]
-                        if match:
-                            contact_info = apollo_service.extract_contact_info(match)
-                            
-                            # Update lead (same logic as single enrichment)
-                            if contact_info["primary_email"] and not lead.email:
-                                lead.email = contact_info["primary_email"]
-                            if contact_info["primary_phone"] and not lead.mobile_phone:
-                                lead.mobile_phone = contact_info["primary_phone"]
-                            if contact_info["all_phones"]:
-                                lead.phone_numbers = contact_info["all_phones"]
-                            
-                            lead.enrichment_status = "enriched"
-                            lead.apollo_enriched_at = datetime.utcnow()
-                            lead.apollo_match_confidence = contact_info["confidence"]
-                            lead.apollo_credits_used += credits_per_lead
-                        else:
-                            lead.enrichment_status = "failed"
+                for lead, match in zip(chunk, matches):
+                    if not match:
+                        updates.append({"id": lead.id, "enrichment_status": "failed"})
+                        continue
                     
-                    session.add(lead)
-                
-                session.commit()
-                logger.info(f"Bulk enriched {len(matches)} leads via Apollo")
-            else:
-                logger.error(f"Apollo bulk enrichment failed: {result.get('error')}")
+                    contact_info = apollo_service.extract_contact_info(match)
+                    
+                    # Update lead (same logic as single enrichment)
+                    values = {
+                        "id": lead.id,
+                        "enrichment_status": "enriched",
+                        "apollo_enriched_at": now,
+                        "apollo_match_confidence": contact_info["confidence"],
+                        "apollo_credits_used": lead.apollo_credits_used + credits_per_lead
+                    }
+                    if contact_info["primary_email"] and not lead.email:
+                        values["email"] = contact_info["primary_email"]
+                    if contact_info["primary_phone"] and not lead.mobile_phone:
+                        values["mobile_phone"] = contact_info["primary_phone"]
+                    if contact_info["all_phones"]:
+                        values["phone_numbers"] = contact_info["all_phones"]
+                    updates.append(values)
+            
+            if updates:
+                await session.execute(update(Lead), updates)
+                await session.commit()
+            logger.info(f"Bulk enriched {matched} leads via Apollo")
     
     except Exception as e:
         logger.error(f"Bulk enrichment task failed: {str(e)}")
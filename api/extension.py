@@ -3,23 +3,44 @@ Extension API routes.
 Endpoints for Chrome extension to fetch and update outreach messages.
 """
 import uuid
+import hashlib
 import secrets
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import and_, func, or_, update
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
 
 from backend.database import get_session
-from backend.api.deps import get_current_user
+from backend.core.cache import cache_get, cache_set, cache_delete
+from backend.core.security import hash_token
+from backend.api.deps import get_current_user, get_extension_user
+from backend.repositories.token_repo import extension_token_cache_key, EXTENSION_TOKEN_CACHE_TTL
 from backend.models.user import User
 from backend.models.outreach import OutreachMessage
 from backend.models.lead import Lead
+from backend.models.token import ExtensionToken
 
 
 router = APIRouter(prefix="/api/extension", tags=["extension"])
 
+# Lifetime of tokens issued to the Chrome extension
+EXTENSION_TOKEN_TTL = 30 * 24 * 60 * 60  # 30 days
+
+# Extension stats change only when message statuses do; cache briefly per org
+STATS_CACHE_TTL = 10
+
+# How long a message claimed by GET /queue stays 'sending' before it may be
+# handed out again (the extension crashed, its tab closed, or it never reported)
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def _stats_cache_key(org_id: uuid.UUID) -> str:
+    return f"ext_stats:{org_id}"
+
 
 # =============================================================================
 # SCHEMAS
@@ -81,15 +102,22 @@ async def generate_extension_token(
     
     Token is valid for 30 days.
     """
-    # Generate a secure token
+    # Generate a secure token; only its hash is stored
     token = secrets.token_urlsafe(32)
+    token_hash = hash_token(token)
     
-    # In production, store this in database with expiration
-    # For now, we'll use the access token pattern
+    session.add(ExtensionToken(
+        user_id=current_user.id,
+        org_id=current_user.current_org_id,
+        token_hash=token_hash,
+        expires_at=datetime.utcnow() + timedelta(seconds=EXTENSION_TOKEN_TTL)
+    ))
+    await session.commit()
+    await cache_set(extension_token_cache_key(token_hash), str(current_user.id), EXTENSION_TOKEN_CACHE_TTL)
     
     return ExtensionTokenResponse(
         token=token,
-        expires_in=30 * 24 * 60 * 60,  # 30 days in seconds
+        expires_in=EXTENSION_TOKEN_TTL,
         user_email=current_user.email,
         org_id=str(current_user.current_org_id)
     )
@@ -97,44 +125,98 @@ async def generate_extension_token(
 
 @router.get("/queue", response_model=MessageQueueResponse)
 async def get_message_queue(
+    request: Request,
+    response: Response,
     limit: int = Query(default=20, le=100),
     channel: str = Query(default="linkedin"),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_extension_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
-    Get pending messages for the extension to send.
-    Returns messages with status 'queued' or 'pending' that are ready to send.
+    Claim pending messages for the extension to send.
+    Returns up to `limit` messages with status 'queued' or 'pending' and marks them 'sending'.
+    
+    This GET is not idempotent: each call claims the messages it returns. A claim
+    is a lease of CLAIM_LEASE; the extension must report 'sent' or 'failed' (or
+    'sending' again to renew) before it runs out, otherwise the message is
+    handed out again by a later poll.
+    Supports If-None-Match: returns 304 when the queue has not changed since the last poll.
     """
-    # Query messages that are queued for extension sending
-    query = select(OutreachMessage).where(
+    now = datetime.utcnow()
+    queue_filter = (
         OutreachMessage.org_id == current_user.current_org_id,
         OutreachMessage.channel == channel,
-        OutreachMessage.status.in_(["pending", "queued"]),
-        OutreachMessage.send_method == "extension"
-    ).order_by(OutreachMessage.created_at.asc()).limit(limit)
+        OutreachMessage.send_method == "extension",
+        or_(
+            OutreachMessage.status.in_(["pending", "queued"]),
+            # Expired claims; updated_at is the claim time while 'sending'
+            and_(
+                OutreachMessage.status == "sending",
+                OutreachMessage.updated_at < now - CLAIM_LEASE
+            )
+        )
+    )
     
-    result = await session.exec(query)
-    messages = result.all()
-    
-    # Enrich with lead data
-    queued_messages = []
-    for msg in messages:
-        # Get lead info
-        lead = await session.get(Lead, msg.lead_id)
-        if lead:
-            queued_messages.append(QueuedMessage(
-                id=str(msg.id),
-                lead_name=lead.name,
-                lead_company=lead.company,
-                linkedin_url=lead.linkedin_url or msg.linkedin_profile_url or "",
-                message=msg.message,
-                channel=msg.channel,
-                template_name=None,  # Could join with template
-                created_at=msg.created_at.isoformat()
-            ))
-    
-    return MessageQueueResponse(
+    # Cheap fingerprint of the queue (served from the queue index) before fetching rows
+    summary = await session.exec(
+        select(func.count(), func.max(OutreachMessage.updated_at)).where(*queue_filter)
+    )
+    count, last_updated = summary.one()
+    etag = '"' + hashlib.sha1(
+        f"{count}:{last_updated}:{channel}:{limit}".encode("utf-8")
+    ).hexdigest() + '"'
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # Atomically claim the next batch: rows another poll (e.g. a second extension
+    # tab) has locked are skipped, and claimed rows move to 'sending' with a
+    # fresh updated_at so they are not handed out again while the lease lasts.
+    # The lead is joined in via UPDATE ... FROM.
+    claimable = select(OutreachMessage.id).where(*queue_filter).order_by(
+        OutreachMessage.created_at.asc()
+    ).limit(limit).with_for_update(skip_locked=True)
+    
+    claim = update(OutreachMessage).where(
+        OutreachMessage.id.in_(claimable.scalar_subquery()),
+        Lead.id == OutreachMessage.lead_id
+    ).values(
+        status="sending",
+        updated_at=now
+    ).returning(
+        OutreachMessage.id,
+        OutreachMessage.message,
+        OutreachMessage.channel,
+        OutreachMessage.linkedin_profile_url,
+        OutreachMessage.created_at,
+        Lead.name,
+        Lead.company,
+        Lead.linkedin_url
+    ).execution_options(synchronize_session=False)
+    
+    result = await session.execute(claim)
+    rows = sorted(result.all(), key=lambda row: row.created_at)
+    await session.commit()
+    if rows:
+        await cache_delete(_stats_cache_key(current_user.current_org_id))
+    
+    # Rows come straight from the database; skip per-item validation
+    queued_messages = [
+        QueuedMessage.model_construct(
+            id=str(row.id),
+            lead_name=row.name,
+            lead_company=row.company,
+            linkedin_url=row.linkedin_url or row.linkedin_profile_url or "",
+            message=row.message,
+            channel=row.channel,
+            template_name=None,  # Could join with template
+            created_at=row.created_at.isoformat()
+        )
+        for row in rows
+    ]
+    
+    return MessageQueueResponse.model_construct(
         messages=queued_messages,
         count=len(queued_messages)
     )
@@ -144,7 +226,7 @@ async def get_message_queue(
 async def update_message_status(
     message_id: uuid.UUID,
     request: StatusUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_extension_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -161,11 +243,12 @@ async def update_message_status(
         return {"error": "Access denied"}
     
     # Update status
+    now = datetime.utcnow()
     message.status = request.status
-    message.updated_at = datetime.utcnow()
+    message.updated_at = now
     
     if request.status == "sent":
-        message.sent_at = datetime.utcnow()
+        message.sent_at = now
     
     if request.error_message:
         message.error_message = request.error_message
@@ -179,6 +262,7 @@ async def update_message_status(
     
     session.add(message)
     await session.commit()
+    await cache_delete(_stats_cache_key(current_user.current_org_id))
     
     return {
         "message": f"Status updated to {request.status}",
@@ -189,34 +273,60 @@ async def update_message_status(
 @router.post("/messages/batch-status")
 async def batch_update_status(
     updates: List[BatchStatusUpdate],
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_extension_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
     Batch update multiple message statuses.
     Useful when extension sends multiple messages.
     """
-    updated = 0
+    now = datetime.utcnow()
     errors = []
     
-    for update in updates:
+    # Last update wins if the same message appears twice in a batch
+    requested = {}
+    for item in updates:
         try:
-            message = await session.get(OutreachMessage, uuid.UUID(update.message_id))
-            if message and message.org_id == current_user.current_org_id:
-                message.status = update.status
-                message.updated_at = datetime.utcnow()
-                if update.status == "sent":
-                    message.sent_at = datetime.utcnow()
-                if update.error_message:
-                    message.error_message = update.error_message
-                session.add(message)
-                updated += 1
-            else:
-                errors.append(f"Message {update.message_id} not found or access denied")
-        except Exception as e:
-            errors.append(f"Error updating {update.message_id}: {str(e)}")
+            requested[uuid.UUID(item.message_id)] = item
+        except ValueError as e:
+            errors.append(f"Error updating {item.message_id}: {str(e)}")
+    
+    # One ownership check for the whole batch
+    owned = set()
+    if requested:
+        result = await session.exec(
+            select(OutreachMessage.id).where(
+                OutreachMessage.id.in_(list(requested)),
+                OutreachMessage.org_id == current_user.current_org_id
+            )
+        )
+        owned = set(result.all())
+    
+    # Group by resulting column values so each group is a single UPDATE
+    groups = defaultdict(list)
+    for message_id, item in requested.items():
+        if message_id in owned:
+            groups[(item.status, item.error_message)].append(message_id)
+        else:
+            errors.append(f"Message {item.message_id} not found or access denied")
+    
+    for (new_status, error_message), ids in groups.items():
+        values = {"status": new_status, "updated_at": now}
+        if new_status == "sent":
+            values["sent_at"] = now
+        if error_message:
+            values["error_message"] = error_message
+        await session.execute(
+            update(OutreachMessage)
+            .where(OutreachMessage.id.in_(ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
     
     await session.commit()
+    updated = sum(len(ids) for ids in groups.values())
+    if updated:
+        await cache_delete(_stats_cache_key(current_user.current_org_id))
     
     return {
         "updated": updated,
@@ -228,7 +338,7 @@ async def batch_update_status(
 @router.post("/messages/{message_id}/queue")
 async def queue_message_for_extension(
     message_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_extension_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -248,6 +358,7 @@ async def queue_message_for_extension(
     
     session.add(message)
     await session.commit()
+    await cache_delete(_stats_cache_key(current_user.current_org_id))
     
     return {
         "message": "Message queued for extension",
@@ -257,15 +368,18 @@ async def queue_message_for_extension(
 
 @router.get("/stats")
 async def get_extension_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_extension_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
     Get extension sending statistics.
     """
-    # Count messages by status for extension
-    from sqlalchemy import func
+    cache_key = _stats_cache_key(current_user.current_org_id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
     
+    # Count messages by status for extension
     query = select(
         OutreachMessage.status,
         func.count(OutreachMessage.id)
@@ -277,13 +391,15 @@ async def get_extension_stats(
     result = await session.exec(query)
     stats = {row[0]: row[1] for row in result.all()}
     
-    return {
+    response = {
         "queued": stats.get("queued", 0),
         "sending": stats.get("sending", 0),
         "sent": stats.get("sent", 0),
         "failed": stats.get("failed", 0),
         "total": sum(stats.values())
     }
+    await cache_set(cache_key, response, STATS_CACHE_TTL)
+    return response
 
 
 class ManualIngestRequest(BaseModel):
@@ -295,7 +411,7 @@ class ManualIngestRequest(BaseModel):
 @router.post("/ingest/post")
 async def ingest_manual_post(
     request: ManualIngestRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_extension_user),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -1,9 +1,11 @@
 """
 Leads API routes.
 """
+import io
 import uuid
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Query, UploadFile, File, Response
+from fastapi import APIRouter, Depends, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -83,10 +85,9 @@ async def export_leads(
     filters = LeadFilter(status=status, campaign_id=campaign_id) if status or campaign_id else None
     
     lead_service = LeadService(session)
-    csv_content = await lead_service.export(current_user.current_org_id, filters)
     
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        lead_service.export(current_user.current_org_id, filters),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=leads_export.csv"}
     )
@@ -100,14 +101,14 @@ async def import_leads(
     session: AsyncSession = Depends(get_session)
 ):
     """Import leads from CSV file."""
-    content = await file.read()
-    csv_content = content.decode("utf-8")
+    # Parse straight off the spooled upload instead of decoding it into one string
+    csv_file = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
     
     lead_service = LeadService(session)
     return await lead_service.import_csv(
         current_user.current_org_id,
         current_user.id,
-        csv_content,
+        csv_file,
         campaign_id
     )
 
@@ -2,12 +2,16 @@
 LinkedIn OAuth and API routes.
 Supports both user-level (personal) and organization-level (shared) LinkedIn connections.
 """
+import re
 import uuid
-import secrets
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import RedirectResponse
+from sqlalchemy import and_, or_, case, func, insert, update
+from sqlalchemy.orm import joinedload, load_only, raiseload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
@@ -15,20 +19,50 @@ from pydantic import BaseModel
 from backend.database import get_session
 from backend.config import settings
 from backend.api.deps import get_current_user
+from backend.core.security import create_token, verify_token, hash_token
+from backend.core.cache import cache_set, cache_pop
 from backend.models.user import User
 from backend.models.outreach import OutreachMessage
 from backend.models.lead import Lead
 from backend.models.linkedin import LinkedInCredential, LinkedInPreference
 from backend.services.integrations.linkedin import (
     LinkedInAPIClient, 
-    LinkedInConfig, 
     LinkedInService,
-    get_linkedin_service
+    get_linkedin_service,
+    linkedin_config
 )
 
 
 router = APIRouter(prefix="/api/linkedin", tags=["linkedin"])
 
+# Concurrent LinkedIn API calls per batch send, to stay under rate limits
+LINKEDIN_SEND_CONCURRENCY = 5
+
+# How long a user has to complete the LinkedIn consent screen
+OAUTH_STATE_TTL_MINUTES = 10
+
+
+def _oauth_state_key(state: str) -> str:
+    return f"oauth_state:{hash_token(state)}"
+
+
+# Webhook event -> (message status, timestamp field set with it)
+WEBHOOK_STATUS_UPDATES = {
+    "MESSAGE_DELIVERED": ("delivered", "delivered_at"),
+    "MESSAGE_OPENED": ("opened", "opened_at"),
+    "MESSAGE_REPLIED": ("replied", "replied_at"),
+}
+
+# Sends only read these lead columns; anything else (including relationships)
+# raises instead of silently lazy-loading per lead
+_SEND_LEAD_OPTIONS = (
+    load_only(Lead.id, Lead.linkedin_url, Lead.name, Lead.company, Lead.title),
+    raiseload("*"),
+)
+
+# Placeholders supported by batch message templates, substituted in one pass
+_PLACEHOLDER_RE = re.compile(r"\{\{(name|company|title|first_name)\}\}")
+
 
 # =============================================================================
 # SCHEMAS
@@ -87,46 +121,174 @@ class WebhookPayload(BaseModel):
 # CREDENTIAL HELPERS
 # =============================================================================
 
+# Credentials, preferences and resolved tokens keyed by ("personal", user_id),
+# ("organization", org_id), ("preference", user_id, org_id) and
+# ("token", user_id, org_id). Tokens are long-lived OAuth grants, so a 60s
+# window of staleness on other workers is acceptable; writes here invalidate.
+_credential_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+_MISSING = object()
+
+
 async def get_user_credential(
     user_id: uuid.UUID, 
-    session: AsyncSession
+    session: AsyncSession,
+    use_cache: bool = True
 ) -> Optional[LinkedInCredential]:
     """Get user's personal LinkedIn credential."""
+    key = ("personal", user_id)
+    cached = _credential_cache.get(key, _MISSING) if use_cache else _MISSING
+    if cached is not _MISSING:
+        return cached
+    
     query = select(LinkedInCredential).where(
         LinkedInCredential.user_id == user_id,
         LinkedInCredential.credential_type == "personal",
         LinkedInCredential.is_active == True
     )
     result = await session.exec(query)
-    return result.first()
+    cred = result.first()
+    _credential_cache[key] = cred
+    return cred
 
 
 async def get_org_credential(
     org_id: uuid.UUID, 
-    session: AsyncSession
+    session: AsyncSession,
+    use_cache: bool = True
 ) -> Optional[LinkedInCredential]:
     """Get organization's shared LinkedIn credential."""
+    key = ("organization", org_id)
+    cached = _credential_cache.get(key, _MISSING) if use_cache else _MISSING
+    if cached is not _MISSING:
+        return cached
+    
     query = select(LinkedInCredential).where(
         LinkedInCredential.org_id == org_id,
         LinkedInCredential.credential_type == "organization",
         LinkedInCredential.is_active == True
     )
     result = await session.exec(query)
-    return result.first()
+    cred = result.first()
+    _credential_cache[key] = cred
+    return cred
 
 
 async def get_user_preference(
     user_id: uuid.UUID,
     org_id: uuid.UUID,
-    session: AsyncSession
+    session: AsyncSession,
+    use_cache: bool = True
 ) -> Optional[LinkedInPreference]:
     """Get user's preference for which credential to use in this org."""
+    key = ("preference", user_id, org_id)
+    cached = _credential_cache.get(key, _MISSING) if use_cache else _MISSING
+    if cached is not _MISSING:
+        return cached
+    
     query = select(LinkedInPreference).where(
         LinkedInPreference.user_id == user_id,
         LinkedInPreference.org_id == org_id
     )
     result = await session.exec(query)
-    return result.first()
+    preference = result.first()
+    _credential_cache[key] = preference
+    return preference
+
+
+def _deactivate_credentials(
+    credential_type: str,
+    user_id: uuid.UUID,
+    org_id: Optional[uuid.UUID]
+):
+    """UPDATE statement retiring the active credentials a new one replaces."""
+    if credential_type == "personal":
+        owner = and_(
+            LinkedInCredential.user_id == user_id,
+            LinkedInCredential.credential_type == "personal"
+        )
+    else:
+        owner = and_(
+            LinkedInCredential.org_id == org_id,
+            LinkedInCredential.credential_type == "organization"
+        )
+    
+    return (
+        update(LinkedInCredential)
+        .where(owner, LinkedInCredential.is_active == True)
+        .values(is_active=False, updated_at=datetime.utcnow())
+    )
+
+
+def forget_linkedin_credentials(
+    user_id: Optional[uuid.UUID] = None,
+    org_id: Optional[uuid.UUID] = None
+) -> None:
+    """Drop cached credentials, preferences and tokens touching a user or org."""
+    ids = {i for i in (user_id, org_id) if i is not None}
+    for key in list(_credential_cache.keys()):
+        if ids.intersection(key[1:]):
+            _credential_cache.pop(key, None)
+
+
+async def load_credentials(
+    user: User,
+    session: AsyncSession
+) -> tuple[Optional[LinkedInCredential], Optional[LinkedInCredential], Optional[LinkedInPreference]]:
+    """
+    Fetch (personal credential, org credential, preference) in one query,
+    with the org credential's connected_by user joined in.
+    """
+    key = ("credentials", user.id, user.current_org_id)
+    cached = _credential_cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    
+    query = (
+        select(LinkedInCredential, LinkedInPreference)
+        .outerjoin(
+            LinkedInPreference,
+            and_(
+                LinkedInPreference.user_id == user.id,
+                LinkedInPreference.org_id == user.current_org_id
+            )
+        )
+        .options(
+            # Only the display name is shown for whoever connected the org account
+            joinedload(LinkedInCredential.connected_by).load_only(User.full_name, User.email)
+        )
+        .where(
+            LinkedInCredential.is_active == True,
+            or_(
+                and_(
+                    LinkedInCredential.user_id == user.id,
+                    LinkedInCredential.credential_type == "personal"
+                ),
+                and_(
+                    LinkedInCredential.org_id == user.current_org_id,
+                    LinkedInCredential.credential_type == "organization"
+                )
+            )
+        )
+    )
+    result = await session.exec(query)
+    rows = result.all()
+    
+    personal = org = preference = None
+    for cred, pref in rows:
+        preference = preference or pref
+        if cred.credential_type == "personal":
+            personal = personal or cred
+        else:
+            org = org or cred
+    
+    # The preference rides along on credential rows; without any
+    # credentials it has to be fetched on its own
+    if not rows:
+        preference = await get_user_preference(user.id, user.current_org_id, session)
+    
+    loaded = (personal, org, preference)
+    _credential_cache[key] = loaded
+    return loaded
 
 
 async def get_active_token(
@@ -136,29 +298,55 @@ async def get_active_token(
     """
     Get the LinkedIn token to use based on user preference.
     Returns (token, source) where source is 'personal' or 'organization'.
-    """
-    # Get preference
-    preference = await get_user_preference(user.id, user.current_org_id, session)
-    use_personal = preference.use_personal if preference else True
-    
-    if use_personal:
-        # Try personal credential
-        cred = await get_user_credential(user.id, session)
-        if cred:
-            return cred.access_token, "personal"
-    
-    # Try org credential (fallback or preference)
-    org_cred = await get_org_credential(user.current_org_id, session)
-    if org_cred:
-        return org_cred.access_token, "organization"
     
-    # If preference was org but no org credential, try personal
-    if not use_personal:
-        cred = await get_user_credential(user.id, session)
-        if cred:
-            return cred.access_token, "personal"
+    Both candidate credentials and the preference come back in one query;
+    the choice between them is made here.
+    """
+    key = ("token", user.id, user.current_org_id)
+    cached = _credential_cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    
+    query = (
+        select(LinkedInCredential, LinkedInPreference.use_personal)
+        .outerjoin(
+            LinkedInPreference,
+            and_(
+                LinkedInPreference.user_id == user.id,
+                LinkedInPreference.org_id == user.current_org_id
+            )
+        )
+        .where(
+            LinkedInCredential.is_active == True,
+            or_(
+                and_(
+                    LinkedInCredential.user_id == user.id,
+                    LinkedInCredential.credential_type == "personal"
+                ),
+                and_(
+                    LinkedInCredential.org_id == user.current_org_id,
+                    LinkedInCredential.credential_type == "organization"
+                )
+            )
+        )
+    )
+    result = await session.exec(query)
     
-    return None, "none"
+    tokens: dict[str, str] = {}
+    use_personal = True
+    for cred, preferred in result.all():
+        tokens.setdefault(cred.credential_type, cred.access_token)
+        if preferred is not None:
+            use_personal = preferred
+    
+    # Preferred source first, the other one as fallback
+    order = ("personal", "organization") if use_personal else ("organization", "personal")
+    active = next(
+        ((tokens[source], source) for source in order if source in tokens),
+        (None, "none")
+    )
+    _credential_cache[key] = active
+    return active
 
 
 # =============================================================================
@@ -174,13 +362,7 @@ async def list_credentials(
     List all LinkedIn credentials available to user.
     Shows personal credential and org's shared credential.
     """
-    personal = await get_user_credential(current_user.id, session)
-    org = await get_org_credential(current_user.current_org_id, session)
-    preference = await get_user_preference(
-        current_user.id, 
-        current_user.current_org_id, 
-        session
-    )
+    personal, org, preference = await load_credentials(current_user, session)
     
     credentials = []
     
@@ -196,10 +378,8 @@ async def list_credentials(
     
     if org:
         # Get who connected it
-        connected_by_name = None
-        if org.connected_by_user_id:
-            connected_by = await session.get(User, org.connected_by_user_id)
-            connected_by_name = connected_by.full_name or connected_by.email if connected_by else None
+        connected_by = org.connected_by
+        connected_by_name = connected_by.full_name or connected_by.email if connected_by else None
         
         credentials.append({
             "id": str(org.id),
@@ -230,11 +410,7 @@ async def get_oauth_url(
     Args:
         credential_type: 'personal' or 'organization'
     """
-    config = LinkedInConfig(
-        client_id=getattr(settings, 'LINKEDIN_CLIENT_ID', ''),
-        client_secret=getattr(settings, 'LINKEDIN_CLIENT_SECRET', ''),
-        redirect_uri=f"{getattr(settings, 'BACKEND_URL', 'http://localhost:8000')}/api/linkedin/callback"
-    )
+    config = linkedin_config()
     
     if not config.client_id:
         raise HTTPException(
@@ -242,8 +418,18 @@ async def get_oauth_url(
             detail="LinkedIn integration not configured. Set LINKEDIN_CLIENT_ID and LINKEDIN_CLIENT_SECRET."
         )
     
-    # Encode credential type in state: user_id:type:random
-    state = f"{current_user.id}:{credential_type}:{secrets.token_urlsafe(16)}"
+    # Signed, short-lived state carrying everything the callback needs
+    state = create_token(
+        {
+            "user_id": str(current_user.id),
+            "org_id": str(current_user.current_org_id) if current_user.current_org_id else None,
+            "credential_type": credential_type
+        },
+        token_type="oauth_state",
+        expires_delta=timedelta(minutes=OAUTH_STATE_TTL_MINUTES)
+    )
+    if settings.REDIS_URL:
+        await cache_set(_oauth_state_key(state), True, OAUTH_STATE_TTL_MINUTES * 60)
     
     client = LinkedInAPIClient()
     auth_url = client.get_auth_url(config, state)
@@ -262,25 +448,23 @@ async def oauth_callback(
     session: AsyncSession = Depends(get_session)
 ):
     """LinkedIn OAuth callback - stores credential in database."""
-    # Parse state: user_id:type:random
-    try:
-        parts = state.split(":", 2)
-        user_id = uuid.UUID(parts[0])
-        credential_type = parts[1] if len(parts) > 1 else "personal"
-    except:
+    # State is signed by get_oauth_url, so its claims can be trusted as-is
+    claims = verify_token(state, "oauth_state")
+    if not claims:
         raise HTTPException(status_code=400, detail="Invalid state parameter")
     
-    # Get user
-    user = await session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=400, detail="User not found")
+    # With a shared cache, each state is single-use: GETDEL consumes it so a
+    # replayed callback is rejected. Without one, workers can't see each
+    # other's states and the signed expiry is the only guard.
+    if settings.REDIS_URL and not await cache_pop(_oauth_state_key(state)):
+        raise HTTPException(status_code=400, detail="State already used or expired")
+    
+    user_id = uuid.UUID(claims["user_id"])
+    org_id = uuid.UUID(claims["org_id"]) if claims.get("org_id") else None
+    credential_type = claims.get("credential_type", "personal")
     
     # Exchange code for token
-    config = LinkedInConfig(
-        client_id=getattr(settings, 'LINKEDIN_CLIENT_ID', ''),
-        client_secret=getattr(settings, 'LINKEDIN_CLIENT_SECRET', ''),
-        redirect_uri=f"{getattr(settings, 'BACKEND_URL', 'http://localhost:8000')}/api/linkedin/callback"
-    )
+    config = linkedin_config()
     
     client = LinkedInAPIClient()
     try:
@@ -300,26 +484,14 @@ async def oauth_callback(
             profile_id = None
         
         # Deactivate any existing credential of same type
-        if credential_type == "personal":
-            query = select(LinkedInCredential).where(
-                LinkedInCredential.user_id == user_id,
-                LinkedInCredential.credential_type == "personal"
-            )
-        else:
-            query = select(LinkedInCredential).where(
-                LinkedInCredential.org_id == user.current_org_id,
-                LinkedInCredential.credential_type == "organization"
-            )
-        
-        result = await session.exec(query)
-        for old_cred in result.all():
-            old_cred.is_active = False
-            session.add(old_cred)
+        await session.execute(
+            _deactivate_credentials(credential_type, user_id, org_id)
+        )
         
         # Create new credential
         credential = LinkedInCredential(
             user_id=user_id if credential_type == "personal" else None,
-            org_id=user.current_org_id if credential_type == "organization" else None,
+            org_id=org_id if credential_type == "organization" else None,
             credential_type=credential_type,
             access_token=access_token,
             refresh_token=refresh_token,
@@ -330,6 +502,7 @@ async def oauth_callback(
         )
         session.add(credential)
         await session.commit()
+        forget_linkedin_credentials(user_id, org_id)
         
         # Redirect to frontend
         frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
@@ -341,8 +514,6 @@ async def oauth_callback(
         return RedirectResponse(
             url=f"{frontend_url}/settings/integrations?linkedin=error&message={str(e)}"
         )
-    finally:
-        await client.close()
 
 
 @router.post("/connect")
@@ -355,21 +526,9 @@ async def connect_linkedin(
     credential_type = request.credential_type
     
     # Deactivate existing
-    if credential_type == "personal":
-        query = select(LinkedInCredential).where(
-            LinkedInCredential.user_id == current_user.id,
-            LinkedInCredential.credential_type == "personal"
-        )
-    else:
-        query = select(LinkedInCredential).where(
-            LinkedInCredential.org_id == current_user.current_org_id,
-            LinkedInCredential.credential_type == "organization"
-        )
-    
-    result = await session.exec(query)
-    for old_cred in result.all():
-        old_cred.is_active = False
-        session.add(old_cred)
+    await session.execute(
+        _deactivate_credentials(credential_type, current_user.id, current_user.current_org_id)
+    )
     
     # Create new credential
     credential = LinkedInCredential(
@@ -382,6 +541,7 @@ async def connect_linkedin(
     )
     session.add(credential)
     await session.commit()
+    forget_linkedin_credentials(current_user.id, current_user.current_org_id)
     
     return {
         "message": f"LinkedIn {credential_type} credential connected successfully",
@@ -397,14 +557,15 @@ async def disconnect_linkedin(
 ):
     """Disconnect LinkedIn credential."""
     if credential_type == "personal":
-        cred = await get_user_credential(current_user.id, session)
+        cred = await get_user_credential(current_user.id, session, use_cache=False)
     else:
-        cred = await get_org_credential(current_user.current_org_id, session)
+        cred = await get_org_credential(current_user.current_org_id, session, use_cache=False)
     
     if cred:
         cred.is_active = False
         session.add(cred)
         await session.commit()
+        forget_linkedin_credentials(current_user.id, current_user.current_org_id)
     
     return {"message": f"LinkedIn {credential_type} disconnected"}
 
@@ -419,7 +580,8 @@ async def set_preference(
     preference = await get_user_preference(
         current_user.id, 
         current_user.current_org_id, 
-        session
+        session,
+        use_cache=False
     )
     
     if preference:
@@ -434,6 +596,7 @@ async def set_preference(
     
     session.add(preference)
     await session.commit()
+    forget_linkedin_credentials(current_user.id, current_user.current_org_id)
     
     return {
         "message": f"Now using {'personal' if request.use_personal else 'organization'} LinkedIn",
@@ -447,29 +610,62 @@ async def get_linkedin_status(
     session: AsyncSession = Depends(get_session)
 ):
     """Get comprehensive LinkedIn status."""
-    personal = await get_user_credential(current_user.id, session)
-    org = await get_org_credential(current_user.current_org_id, session)
-    preference = await get_user_preference(
-        current_user.id, 
-        current_user.current_org_id, 
-        session
+    key = ("status", current_user.id, current_user.current_org_id)
+    cached = _credential_cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    
+    # One aggregate row over both candidate credentials: Python only
+    # receives the scalars the response needs, no ORM objects
+    is_personal = LinkedInCredential.credential_type == "personal"
+    is_org = LinkedInCredential.credential_type == "organization"
+    use_personal = (
+        select(LinkedInPreference.use_personal)
+        .where(
+            LinkedInPreference.user_id == current_user.id,
+            LinkedInPreference.org_id == current_user.current_org_id
+        )
+        .limit(1)
+        .scalar_subquery()
     )
-    
-    # Get org connected by name
-    org_connected_by = None
-    if org and org.connected_by_user_id:
-        connected_by = await session.get(User, org.connected_by_user_id)
-        org_connected_by = connected_by.full_name or connected_by.email if connected_by else None
-    
-    return LinkedInStatusResponse(
-        personal_connected=personal is not None,
-        personal_profile_name=personal.linkedin_profile_name if personal else None,
-        org_connected=org is not None,
-        org_profile_name=org.linkedin_profile_name if org else None,
+    query = (
+        select(
+            func.coalesce(func.bool_or(is_personal), False),
+            func.max(case((is_personal, LinkedInCredential.linkedin_profile_name))),
+            func.coalesce(func.bool_or(is_org), False),
+            func.max(case((is_org, LinkedInCredential.linkedin_profile_name))),
+            func.max(case((is_org, func.coalesce(func.nullif(User.full_name, ""), User.email)))),
+            func.coalesce(use_personal, True),
+            func.coalesce(func.bool_or(LinkedInCredential.has_sales_navigator), False)
+        )
+        .select_from(LinkedInCredential)
+        .outerjoin(User, User.id == LinkedInCredential.connected_by_user_id)
+        .where(
+            LinkedInCredential.is_active == True,
+            or_(
+                and_(LinkedInCredential.user_id == current_user.id, is_personal),
+                and_(LinkedInCredential.org_id == current_user.current_org_id, is_org)
+            )
+        )
+    )
+    result = await session.exec(query)
+    (
+        personal_connected, personal_profile_name,
+        org_connected, org_profile_name, org_connected_by,
+        using_personal, has_sales_navigator
+    ) = result.one()
+    
+    status = LinkedInStatusResponse(
+        personal_connected=personal_connected,
+        personal_profile_name=personal_profile_name,
+        org_connected=org_connected,
+        org_profile_name=org_profile_name,
         org_connected_by=org_connected_by,
-        using_personal=preference.use_personal if preference else True,
-        has_sales_navigator=bool((personal and personal.has_sales_navigator) or (org and org.has_sales_navigator))
+        using_personal=using_personal,
+        has_sales_navigator=has_sales_navigator
     )
+    _credential_cache[key] = status
+    return status
 
 
 # =============================================================================
@@ -493,7 +689,10 @@ async def send_linkedin_message(
         )
     
     # Get lead
-    lead = await session.get(Lead, request.lead_id)
+    result = await session.exec(
+        select(Lead).options(*_SEND_LEAD_OPTIONS).where(Lead.id == request.lead_id)
+    )
+    lead = result.first()
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     
@@ -502,38 +701,35 @@ async def send_linkedin_message(
     
     # Send message
     service = get_linkedin_service(token)
-    try:
-        result = await service.send_outreach_message(
-            recipient_linkedin_url=lead.linkedin_url,
-            message=request.message,
-            message_type=request.message_type
-        )
-        
-        # Record message
-        outreach_msg = OutreachMessage(
-            org_id=current_user.current_org_id,
-            lead_id=lead.id,
-            channel="linkedin",
-            message=request.message,
-            send_method="api",
-            status="sent" if result.get("success") else "failed",
-            linkedin_message_id=result.get("message_id"),
-            linkedin_profile_url=lead.linkedin_url,
-            sent_at=datetime.utcnow() if result.get("success") else None,
-            error_message=result.get("error")
-        )
-        session.add(outreach_msg)
-        await session.commit()
-        
-        return {
-            "success": result.get("success", False),
-            "sent_via": source,  # Shows which credential was used
-            "message_id": str(outreach_msg.id),
-            "linkedin_message_id": result.get("message_id"),
-            "error": result.get("error")
-        }
-    finally:
-        await service.close()
+    result = await service.send_outreach_message(
+        recipient_linkedin_url=lead.linkedin_url,
+        message=request.message,
+        message_type=request.message_type
+    )
+    
+    # Record message
+    outreach_msg = OutreachMessage(
+        org_id=current_user.current_org_id,
+        lead_id=lead.id,
+        channel="linkedin",
+        message=request.message,
+        send_method="api",
+        status="sent" if result.get("success") else "failed",
+        linkedin_message_id=result.get("message_id"),
+        linkedin_profile_url=lead.linkedin_url,
+        sent_at=datetime.utcnow() if result.get("success") else None,
+        error_message=result.get("error")
+    )
+    session.add(outreach_msg)
+    await session.commit()
+    
+    return {
+        "success": result.get("success", False),
+        "sent_via": source,  # Shows which credential was used
+        "message_id": str(outreach_msg.id),
+        "linkedin_message_id": result.get("message_id"),
+        "error": result.get("error")
+    }
 
 
 @router.post("/send-batch")
@@ -549,40 +745,68 @@ async def send_batch_messages(
     if not token:
         raise HTTPException(status_code=400, detail="No LinkedIn connected")
     
-    results = []
+    result = await session.exec(
+        select(Lead).options(*_SEND_LEAD_OPTIONS).where(Lead.id.in_(lead_ids))
+    )
+    leads = {lead.id: lead for lead in result.all()}
+    
+    # Personalize up front; only the API calls run concurrently
+    results = {}
+    to_send = []
+    for lead_id in lead_ids:
+        lead = leads.get(lead_id)
+        if not lead or not lead.linkedin_url:
+            results[lead_id] = {"lead_id": str(lead_id), "success": False, "error": "No LinkedIn URL"}
+            continue
+        
+        name = lead.name or ""
+        values = {
+            "name": name,
+            "company": lead.company or "",
+            "title": lead.title or "",
+            "first_name": name.split(None, 1)[0] if name.strip() else ""
+        }
+        msg = _PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], message_template)
+        to_send.append((lead, msg))
+    
     service = get_linkedin_service(token)
+    semaphore = asyncio.Semaphore(LINKEDIN_SEND_CONCURRENCY)
     
-    try:
-        for lead_id in lead_ids:
-            lead = await session.get(Lead, lead_id)
-            if not lead or not lead.linkedin_url:
-                results.append({"lead_id": str(lead_id), "success": False, "error": "No LinkedIn URL"})
-                continue
-            
-            # Personalize
-            msg = message_template.replace("{{name}}", lead.name or "")
-            msg = msg.replace("{{company}}", lead.company or "")
-            msg = msg.replace("{{title}}", lead.title or "")
-            msg = msg.replace("{{first_name}}", (lead.name or "").split()[0] if lead.name else "")
-            
-            result = await service.send_outreach_message(lead.linkedin_url, msg, message_type)
-            
-            outreach_msg = OutreachMessage(
-                org_id=current_user.current_org_id,
-                lead_id=lead.id,
-                channel="linkedin",
-                message=msg,
-                send_method="api",
-                status="sent" if result.get("success") else "failed",
-                linkedin_message_id=result.get("message_id"),
-                sent_at=datetime.utcnow() if result.get("success") else None
-            )
-            session.add(outreach_msg)
-            results.append({"lead_id": str(lead_id), "success": result.get("success", False)})
+    async def send_one(lead: Lead, msg: str) -> dict:
+        async with semaphore:
+            return await service.send_outreach_message(lead.linkedin_url, msg, message_type)
+    
+    sent = await asyncio.gather(
+        *(send_one(lead, msg) for lead, msg in to_send),
+        return_exceptions=True
+    )
+    
+    rows = []
+    for (lead, msg), result in zip(to_send, sent):
+        if isinstance(result, Exception):
+            result = {"success": False, "error": str(result)}
         
+        rows.append(OutreachMessage(
+            org_id=current_user.current_org_id,
+            lead_id=lead.id,
+            channel="linkedin",
+            message=msg,
+            send_method="api",
+            status="sent" if result.get("success") else "failed",
+            linkedin_message_id=result.get("message_id"),
+            sent_at=datetime.utcnow() if result.get("success") else None,
+            error_message=result.get("error")
+        ).model_dump())
+        results[lead.id] = {"lead_id": str(lead.id), "success": result.get("success", False)}
+    
+    # One executemany INSERT (batched into multi-row VALUES) instead of
+    # per-object unit-of-work bookkeeping; the rows aren't read back
+    if rows:
+        await session.execute(insert(OutreachMessage), rows)
         await session.commit()
-    finally:
-        await service.close()
+    
+    # Report in request order
+    results = [results[lead_id] for lead_id in lead_ids]
     
     return {
         "sent_via": source,
@@ -604,27 +828,17 @@ async def linkedin_webhook(
     """Handle LinkedIn webhooks."""
     event_type = payload.event_type
     resource_id = payload.resource_id
-    
-    if resource_id:
-        query = select(OutreachMessage).where(
-            OutreachMessage.linkedin_message_id == resource_id
+    transition = WEBHOOK_STATUS_UPDATES.get(event_type)
+    
+    if resource_id and transition:
+        status, timestamp_field = transition
+        now = datetime.utcnow()
+        await session.execute(
+            update(OutreachMessage)
+            .where(OutreachMessage.linkedin_message_id == resource_id)
+            .values(status=status, updated_at=now, **{timestamp_field: now})
         )
-        result = await session.exec(query)
-        message = result.first()
-        
-        if message:
-            if event_type == "MESSAGE_DELIVERED":
-                message.status = "delivered"
-                message.delivered_at = datetime.utcnow()
-            elif event_type == "MESSAGE_OPENED":
-                message.status = "opened"
-                message.opened_at = datetime.utcnow()
-            elif event_type == "MESSAGE_REPLIED":
-                message.status = "replied"
-                message.replied_at = datetime.utcnow()
-            
-            session.add(message)
-            await session.commit()
+        await session.commit()
     
     return {"status": "received", "event_type": event_type}
 
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.database import get_session
+from backend.core.cache import cache_get, cache_set, cache_delete
 from backend.services.org_service import OrganizationService
 from backend.schemas.organization import (
     CreateOrganizationRequest,
@@ -21,6 +22,15 @@ from backend.models.user import User
 
 router = APIRouter(prefix="/api/organizations", tags=["organizations"])
 
+# A user's org list is fetched on every page load. Membership changes made
+# by the user or on the user (including being invited) invalidate it; changes
+# seen only by other members (renames) show up once the TTL lapses.
+ORGS_CACHE_TTL = 30
+
+
+def _orgs_cache_key(user_id: uuid.UUID) -> str:
+    return f"orgs:{user_id}"
+
 
 @router.post("/")
 async def create_organization(
@@ -33,13 +43,15 @@ async def create_organization(
     Current user becomes the owner of the new organization.
     """
     org_service = OrganizationService(session)
-    return await org_service.create_organization(
+    result = await org_service.create_organization(
         user=current_user,
         name=request.name,
         domain=request.domain,
         industry=request.industry,
         business_model=request.business_model
     )
+    await cache_delete(_orgs_cache_key(current_user.id))
+    return result
 
 
 @router.get("/")
@@ -50,8 +62,13 @@ async def list_my_organizations(
     """
     List all organizations the current user belongs to.
     """
-    org_service = OrganizationService(session)
-    orgs = await org_service.get_user_organizations(current_user.id)
+    cache_key = _orgs_cache_key(current_user.id)
+    orgs = await cache_get(cache_key)
+    if orgs is None:
+        org_service = OrganizationService(session)
+        orgs = await org_service.get_user_organizations(current_user.id)
+        await cache_set(cache_key, orgs, ORGS_CACHE_TTL)
+    
     return {
         "organizations": orgs,
         "count": len(orgs),
@@ -103,12 +120,14 @@ async def invite_user(
     Requires admin or owner role.
     """
     org_service = OrganizationService(session)
-    return await org_service.invite_user_to_org(
+    result = await org_service.invite_user_to_org(
         org_id=org_id,
         inviter=current_user,
         invitee_email=request.email,
         role=request.role
     )
+    await cache_delete(_orgs_cache_key(result["user_id"]))
+    return result
 
 
 @router.patch("/{org_id}/members/{user_id}")
@@ -124,12 +143,14 @@ async def update_member_role(
     Requires admin or owner role.
     """
     org_service = OrganizationService(session)
-    return await org_service.update_member_role(
+    result = await org_service.update_member_role(
         org_id=org_id,
         admin_user=current_user,
         target_user_id=user_id,
         new_role=request.role
     )
+    await cache_delete(_orgs_cache_key(user_id))
+    return result
 
 
 @router.delete("/{org_id}/members/{user_id}")
@@ -144,11 +165,13 @@ async def remove_member(
     Requires admin or owner role.
     """
     org_service = OrganizationService(session)
-    return await org_service.remove_member(
+    result = await org_service.remove_member(
         org_id=org_id,
         admin_user=current_user,
         target_user_id=user_id
     )
+    await cache_delete(_orgs_cache_key(user_id))
+    return result
 
 
 @router.post("/{org_id}/leave")
@@ -162,7 +185,9 @@ async def leave_organization(
     Owner cannot leave - must transfer ownership first.
     """
     org_service = OrganizationService(session)
-    return await org_service.leave_organization(current_user, org_id)
+    result = await org_service.leave_organization(current_user, org_id)
+    await cache_delete(_orgs_cache_key(current_user.id))
+    return result
 
 
 @router.patch("/{org_id}")
@@ -177,8 +202,10 @@ async def update_organization(
     Requires admin or owner role.
     """
     org_service = OrganizationService(session)
-    return await org_service.update_organization(
+    result = await org_service.update_organization(
         org_id=org_id,
         user_id=current_user.id,
         update_data=update_data.model_dump(exclude_unset=True)
     )
+    await cache_delete(_orgs_cache_key(current_user.id))
+    return result
@@ -4,9 +4,11 @@ Outreach API routes - messages and templates.
 import uuid
 from typing import Optional
 from fastapi import APIRouter, Depends, Query
+from fastapi.encoders import jsonable_encoder
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.database import get_session
+from backend.core.cache import cache_get, cache_set, cache_delete
 from backend.services.outreach_service import OutreachService
 from backend.schemas.outreach import (
     OutreachCreate, OutreachResponse,
@@ -17,6 +19,14 @@ from backend.models.user import User
 
 router = APIRouter(prefix="/api/outreach", tags=["outreach"])
 
+# The unfiltered template list is cached per org and invalidated by the
+# template write endpoints
+TEMPLATES_CACHE_TTL = 300
+
+
+def _templates_cache_key(org_id: uuid.UUID) -> str:
+    return f"templates:{org_id}"
+
 
 # Message endpoints
 @router.post("/", response_model=OutreachResponse, status_code=201)
@@ -38,19 +48,24 @@ async def create_message(
 async def list_messages(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     lead_id: Optional[uuid.UUID] = None,
     status: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session)
 ):
-    """List outreach messages."""
+    """
+    List outreach messages.
+    Pass cursor (empty for the first page, then next_cursor) for keyset paging.
+    """
     outreach_service = OutreachService(session)
     return await outreach_service.list_messages(
         current_user.current_org_id,
         lead_id,
         status,
         page,
-        limit
+        limit,
+        cursor
     )
 
 
@@ -59,6 +74,7 @@ async def get_messages_by_lead(
     lead_id: uuid.UUID,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session)
 ):
@@ -69,7 +85,8 @@ async def get_messages_by_lead(
         lead_id,
         None,
         page,
-        limit
+        limit,
+        cursor
     )
 
 
@@ -108,10 +125,12 @@ async def create_template(
 ):
     """Create a message template."""
     outreach_service = OutreachService(session)
-    return await outreach_service.create_template(
+    template = await outreach_service.create_template(
         current_user.current_org_id,
         template_data
     )
+    await cache_delete(_templates_cache_key(current_user.current_org_id))
+    return template
 
 
 @router.get("/templates/")
@@ -121,9 +140,19 @@ async def list_templates(
     session: AsyncSession = Depends(get_session)
 ):
     """List message templates."""
+    cache_key = _templates_cache_key(current_user.current_org_id)
+    if not channel:
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cached
+    
     outreach_service = OutreachService(session)
     templates = await outreach_service.list_templates(current_user.current_org_id, channel)
-    return {"items": templates, "total": len(templates)}
+    response = jsonable_encoder({"items": templates, "total": len(templates)})
+    
+    if not channel:
+        await cache_set(cache_key, response, TEMPLATES_CACHE_TTL)
+    return response
 
 
 @router.get("/templates/{template_id}", response_model=TemplateResponse)
@@ -146,11 +175,13 @@ async def update_template(
 ):
     """Update a template."""
     outreach_service = OutreachService(session)
-    return await outreach_service.update_template(
+    template = await outreach_service.update_template(
         current_user.current_org_id,
         template_id,
         template_data
     )
+    await cache_delete(_templates_cache_key(current_user.current_org_id))
+    return template
 
 
 @router.delete("/templates/{template_id}", status_code=204)
@@ -162,6 +193,7 @@ async def delete_template(
     """Delete a template."""
     outreach_service = OutreachService(session)
     await outreach_service.delete_template(current_user.current_org_id, template_id)
+    await cache_delete(_templates_cache_key(current_user.current_org_id))
 
 
 @router.post("/templates/{template_id}/render")
@@ -3,9 +3,11 @@ Personas API routes.
 """
 import uuid
 from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.database import get_session
+from backend.core.cache import cache_get, cache_set, cache_delete
 from backend.services.persona_service import PersonaService
 from backend.schemas.persona import PersonaCreate, PersonaUpdate, PersonaResponse
 from backend.api.deps import get_current_user
@@ -13,6 +15,14 @@ from backend.models.user import User
 
 router = APIRouter(prefix="/api/personas", tags=["personas"])
 
+# The settings page polls the active persona list; it only changes via the
+# write endpoints below, which invalidate it
+PERSONAS_CACHE_TTL = 300
+
+
+def _personas_cache_key(org_id: uuid.UUID) -> str:
+    return f"personas:{org_id}"
+
 
 @router.post("/", response_model=PersonaResponse, status_code=201)
 async def create_persona(
@@ -22,7 +32,9 @@ async def create_persona(
 ):
     """Create a new persona/ICP."""
     persona_service = PersonaService(session)
-    return await persona_service.create(current_user.current_org_id, persona_data)
+    persona = await persona_service.create(current_user.current_org_id, persona_data)
+    await cache_delete(_personas_cache_key(current_user.current_org_id))
+    return persona
 
 
 @router.get("/")
@@ -32,9 +44,19 @@ async def list_personas(
     session: AsyncSession = Depends(get_session)
 ):
     """List personas."""
+    cache_key = _personas_cache_key(current_user.current_org_id)
+    if active_only:
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cached
+    
     persona_service = PersonaService(session)
     personas = await persona_service.list(current_user.current_org_id, active_only)
-    return {"items": personas, "total": len(personas)}
+    response = jsonable_encoder({"items": personas, "total": len(personas)})
+    
+    if active_only:
+        await cache_set(cache_key, response, PERSONAS_CACHE_TTL)
+    return response
 
 
 @router.get("/{persona_id}", response_model=PersonaResponse)
@@ -57,7 +79,9 @@ async def update_persona(
 ):
     """Update a persona."""
     persona_service = PersonaService(session)
-    return await persona_service.update(current_user.current_org_id, persona_id, persona_data)
+    persona = await persona_service.update(current_user.current_org_id, persona_id, persona_data)
+    await cache_delete(_personas_cache_key(current_user.current_org_id))
+    return persona
 
 
 @router.delete("/{persona_id}", status_code=204)
@@ -69,3 +93,4 @@ async def delete_persona(
     """Delete a persona."""
     persona_service = PersonaService(session)
     await persona_service.delete(current_user.current_org_id, persona_id)
+    await cache_delete(_personas_cache_key(current_user.current_org_id))
@@ -4,6 +4,7 @@ Scoring API routes.
 import uuid
 from typing import Optional, List
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.database import get_session
@@ -38,8 +39,9 @@ async def list_scoring_rules(
 ):
     """List scoring rules."""
     scoring_service = ScoringService(session)
-    rules = await scoring_service.list_rules(current_user.current_org_id, active_only)
-    return {"items": rules, "total": len(rules)}
+    rules = await scoring_service.list_rules_as_dicts(current_user.current_org_id, active_only)
+    # orjson serializes the UUIDs/datetimes directly; no jsonable_encoder pass
+    return ORJSONResponse({"items": rules, "total": len(rules)})
 
 
 @router.get("/rules/{rule_id}", response_model=ScoringRuleResponse)
@@ -7,10 +7,12 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.database import get_session
+from backend.core.cache import cache_delete
+from backend.repositories.user_repo import user_cache_key
 from backend.services.user_service import UserService
 from backend.schemas.user import UserResponse, UserUpdate, OrganizationResponse, OrganizationUpdate
 from backend.api.deps import get_current_user
-from backend.models.user import User, OrganizationMember
+from backend.models.user import User
 
 router = APIRouter(tags=["users"])
 
@@ -18,23 +20,13 @@ router = APIRouter(tags=["users"])
 # User endpoints
 @router.get("/api/users/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session)
+    current_user: User = Depends(get_current_user)
 ):
     """Get current user profile with role in current organization."""
-    # Get role from OrganizationMember
-    role = None
-    if current_user.current_org_id:
-        query = select(OrganizationMember).where(
-            OrganizationMember.user_id == current_user.id,
-            OrganizationMember.org_id == current_user.current_org_id
-        )
-        result = await session.exec(query)
-        membership = result.first()
-        if membership:
-            role = membership.role
+    # Role is loaded alongside the user by get_current_user
+    role = current_user._cached_role
     
-    return UserResponse(
+    return UserResponse.model_construct(
         id=current_user.id,
         email=current_user.email,
         full_name=current_user.full_name,
@@ -61,19 +53,10 @@ async def update_current_user_profile(
         avatar_url=update_data.avatar_url
     )
     
-    # Get role
-    role = None
-    if updated_user.current_org_id:
-        query = select(OrganizationMember).where(
-            OrganizationMember.user_id == updated_user.id,
-            OrganizationMember.org_id == updated_user.current_org_id
-        )
-        result = await session.exec(query)
-        membership = result.first()
-        if membership:
-            role = membership.role
+    # Profile edits don't touch membership, so the role loaded with the user still holds
+    role = current_user._cached_role
     
-    return UserResponse(
+    return UserResponse.model_construct(
         id=updated_user.id,
         email=updated_user.email,
         full_name=updated_user.full_name,
@@ -117,6 +100,7 @@ async def update_user_settings(
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
     await session.commit()
+    await cache_delete(user_cache_key(current_user.id))
     await session.refresh(current_user)
     
     return {
@@ -1,4 +1,9 @@
+import time
+import hashlib
+
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from jwt.exceptions import InvalidTokenError
@@ -10,19 +15,32 @@ from backend.users.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
+# Decoded tokens: blake2b(token) -> (user_id, exp). Skips re-verifying the
+# HMAC for repeat requests with the same token; exp is still checked on hits.
+_decoded_tokens: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
 async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("user_id")
-        if user_id is None:
+    cache_key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    cached = _decoded_tokens.get(cache_key)
+    
+    if cached and cached[1] > time.time():
+        user_id = cached[0]
+    else:
+        try:
+            payload = await run_in_threadpool(
+                jwt.decode, token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            user_id: str = payload.get("user_id")
+            if user_id is None:
+                raise credentials_exception
+        except InvalidTokenError:
             raise credentials_exception
-    except InvalidTokenError:
-        raise credentials_exception
+        _decoded_tokens[cache_key] = (user_id, payload.get("exp", 0))
         
     user = await session.get(User, user_id)
     if user is None:
@@ -2,10 +2,16 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from backend.database import get_session
 from backend.users.models import User, Organization
-from backend.auth.utils import verify_password, create_access_token, get_password_hash
+from backend.auth.utils import create_access_token
+from backend.core.security import (
+    aget_password_hash, averify_password, is_recent_failed_login, remember_failed_login
+)
 import uuid
+from datetime import datetime
 
 router = APIRouter(tags=["auth"])
 
@@ -18,32 +24,39 @@ async def register(
     org_name: str, 
     session: AsyncSession = Depends(get_session)
 ):
-    # Check if user exists
-    result = await session.exec(select(User).where(User.email == email))
-    if result.first():
+    # Org and user go in one transaction; the unique index on user.email
+    # decides whether the address is taken, so no prior SELECT is needed
+    org_id = uuid.uuid4()
+    await session.execute(
+        insert(Organization).values(id=org_id, name=org_name, created_at=datetime.utcnow())
+    )
+    result = await session.execute(
+        pg_insert(User)
+        .values(
+            id=uuid.uuid4(),
+            email=email,
+            password_hash=await aget_password_hash(password),
+            org_id=org_id
+        )
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(User.id)
+    )
+    if result.first() is None:
+        await session.rollback()
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Create Org
-    org = Organization(name=org_name)
-    session.add(org)
-    await session.commit()
-    await session.refresh(org)
-    
-    # Create User
-    user = User(
-        email=email, 
-        password_hash=get_password_hash(password),
-        org_id=org.id
-    )
-    session.add(user)
     await session.commit()
     return {"message": "User registered successfully"}
 
 @router.post("/token")
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_session)):
+    if is_recent_failed_login(form_data.username, form_data.password):
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    
     result = await session.exec(select(User).where(User.email == form_data.username))
     user = result.first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await averify_password(form_data.password, user.password_hash):
+        remember_failed_login(form_data.username, form_data.password)
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
     access_token = create_access_token(
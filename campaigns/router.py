@@ -1,53 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from sqlmodel import Session, select
-from backend.database import get_session
+"""
+Legacy campaign routes (Apify trigger + CampaignRun history).
+
+Not mounted: /api/campaigns is served by backend.api.campaigns, which already
+runs Apify through CampaignService.run. Do not include this router alongside
+it, or both would register the same paths under the same prefix.
+"""
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from typing import Optional
+from sqlalchemy import tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.database import get_session, async_session_maker
+from backend.core.pagination import create_cursor_response, decode_cursor
 from backend.auth.dependencies import get_current_user
 from backend.users.models import User
 from backend.models.campaign import Campaign
 from backend.models.lead import Lead
+from backend.campaigns.run_models import CampaignRun
+from backend.services.apify_service import apify_service
 
 router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
 
-@router.post("/", response_model=Campaign)
-async def create_campaign(
-    campaign: Campaign, 
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
-):
-    # Ensure org_id matches current user
-    if not campaign.org_id:
-        campaign.org_id = current_user.current_org_id
-        
-    if campaign.org_id != current_user.current_org_id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    session.add(campaign)
-    session.commit()
-    session.refresh(campaign)
-
-    # Trigger Apify if Cloud Scraper is enabled
-    settings = campaign.settings or {}
-    if settings.get("use_cloud_scraper"):
-        from backend.services.apify_service import apify_service
-        
-        # Determine actor ID (default to LinkedIn Scraper likely)
-        # For now using a placeholder or config value. Assuming 'linkedin-post' type maps to a specific actor.
-        actor_id = "kfiWxiIPwaRIQAU42" # Default LinkedIn Post Scraper ID or from config
-        
-        run_input = {
-            "startUrls": [{"url": settings.get("url")}],
-            "maxItems": settings.get("target_count", 10),
-            # Add other filters if needed
-        }
-        
-        result = apify_service.run_actor(actor_id, run_input)
+async def trigger_apify_run(campaign_id: uuid.UUID, run_input: dict):
+    """Start the scraper actor for a new campaign and record the run."""
+    # Determine actor ID (default to LinkedIn Scraper likely)
+    # For now using a placeholder or config value. Assuming 'linkedin-post' type maps to a specific actor.
+    actor_id = "kfiWxiIPwaRIQAU42" # Default LinkedIn Post Scraper ID or from config
+    
+    result = await apify_service.run_actor(actor_id, run_input)
+    
+    async with async_session_maker() as session:
+        campaign = await session.get(Campaign, campaign_id)
+        if not campaign:
+            return
         
         if result["success"]:
             campaign.status = "processing"
             
             # Create CampaignRun
-            from backend.campaigns.run_models import CampaignRun
             run_record = CampaignRun(
                 campaign_id=campaign.id,
                 apify_run_id=result["run_id"],
@@ -56,83 +47,114 @@ async def create_campaign(
             )
             session.add(run_record)
             
+            settings = dict(campaign.settings or {})
             settings["apify_info"] = {
                 "run_id": result["run_id"],
                 "actor_id": result["actor_id"],
                 "triggered_at": "now"
             }
             campaign.settings = settings
-            session.add(campaign)
-            session.commit()
         else:
-            # Log error but don't fail campaign creation entirely?
-            # Or maybe set status to failed
+            # Campaign creation already succeeded; record the failed trigger
             campaign.status = "failed"
-            session.add(campaign)
-            session.commit()
+        
+        session.add(campaign)
+        await session.commit()
+
+@router.post("/", response_model=Campaign)
+async def create_campaign(
+    campaign: Campaign, 
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure org_id matches current user
+    if not campaign.org_id:
+        campaign.org_id = current_user.current_org_id
+        
+    if campaign.org_id != current_user.current_org_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+        
+    session.add(campaign)
+    await session.commit()
+    await session.refresh(campaign)
+
+    # Trigger Apify if Cloud Scraper is enabled. The actor call can take
+    # seconds, so it runs after the response has been sent.
+    settings = campaign.settings or {}
+    if settings.get("use_cloud_scraper"):
+        run_input = {
+            "startUrls": [{"url": settings.get("url")}],
+            "maxItems": settings.get("target_count", 10),
+            # Add other filters if needed
+        }
+        background_tasks.add_task(trigger_apify_run, campaign.id, run_input)
 
     return campaign
 
-@router.get("/", response_model=List[Campaign])
+@router.get("/")
 async def list_campaigns(
-    session: Session = Depends(get_session),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     statement = select(Campaign).where(Campaign.org_id == current_user.current_org_id)
-    results = session.exec(statement)
-    return results.all()
+    if cursor:
+        created_at, campaign_id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(Campaign.created_at, Campaign.id) < tuple_(created_at, campaign_id)
+        )
+    statement = statement.order_by(Campaign.created_at.desc(), Campaign.id.desc()).limit(limit + 1)
+    results = await session.exec(statement)
+    return create_cursor_response(results.all(), limit)
 
 @router.get("/{id}/runs")
 async def get_campaign_runs(
-    id: str,
-    session: Session = Depends(get_session),
+    id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    from backend.campaigns.run_models import CampaignRun
     # Verify campaign ownership
     statement = select(Campaign).where(Campaign.id == id, Campaign.org_id == current_user.current_org_id)
-    campaign = session.exec(statement).first()
+    campaign = (await session.exec(statement)).first()
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
         
     statement = select(CampaignRun).where(CampaignRun.campaign_id == id).order_by(CampaignRun.created_at.desc())
-    results = session.exec(statement)
+    results = await session.exec(statement)
     return results.all()
 
 @router.post("/{id}/run")
 async def run_campaign(
-    id: str,
-    session: Session = Depends(get_session),
+    id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     statement = select(Campaign).where(Campaign.id == id, Campaign.org_id == current_user.current_org_id)
-    campaign = session.exec(statement).first()
+    campaign = (await session.exec(statement)).first()
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
         
-    # Mock execution: Create dummy leads
-    campaign.status = "processing"
-    session.add(campaign)
-    session.commit()
-    
-    # In a real app, this would be a background task
-    import random
-    
-    # Create 3 mock leads
-    for i in range(3):
-        lead = Lead(
+    # Mock execution: create dummy leads and complete the campaign in one commit.
+    # URLs are unique per run: (campaign_id, linkedin_url) is a unique index
+    run_tag = uuid.uuid4().hex[:8]
+    leads = [
+        Lead(
             org_id=campaign.org_id,
             campaign_id=campaign.id,
             name=f"Mock Lead {i+1} from {campaign.name}",
-            linkedin_url=f"https://linkedin.com/in/mock-{i}",
+            linkedin_url=f"https://linkedin.com/in/mock-{run_tag}-{i}",
             status="new",
             source=campaign.type
         )
-        session.add(lead)
+        for i in range(3)
+    ]
+    session.add_all(leads)
         
     campaign.status = "completed"
-    campaign.leads_count += 3
+    campaign.leads_count += len(leads)
     session.add(campaign)
-    session.commit()
+    await session.commit()
     
     return {"status": "started", "message": "Campaign execution started"}
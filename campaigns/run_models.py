@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, DateTime, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 class CampaignRun(SQLModel, table=True):
@@ -9,9 +10,9 @@ class CampaignRun(SQLModel, table=True):
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     campaign_id: uuid.UUID = Field(foreign_key="campaign.id", index=True)
-    apify_run_id: str = Field(index=True)
+    apify_run_id: str = Field(index=True, unique=True)  # Webhook lookup key; one run record per Apify run
     status: str = Field(default="processing") # processing, completed, failed
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    completed_at: Optional[datetime] = None
-    result_data: Dict[str, Any] = Field(default={}, sa_type=JSONB)
-    meta_data: Dict[str, Any] = Field(default={}, sa_type=JSONB) # Extra info like actor_id, logs
+    created_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True), nullable=False, sa_column_kwargs={"server_default": func.now()})
+    completed_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    result_data: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
+    meta_data: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))) # Extra info like actor_id, logs
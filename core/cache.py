@@ -0,0 +1,74 @@
+"""
+Async key-value cache for short-lived computed results.
+Backed by Redis when REDIS_URL is configured (shared across workers),
+otherwise by a bounded in-process LRU with per-key expiry.
+Values must be JSON-serializable. Both backends store the serialized form,
+so every read returns a fresh copy that callers may mutate freely.
+"""
+import time
+from typing import Any, Optional
+
+import orjson
+from cachetools import LRUCache
+
+from backend.config import settings
+
+
+_redis = None
+if settings.REDIS_URL:
+    import redis.asyncio as aioredis
+    _redis = aioredis.from_url(settings.REDIS_URL)
+
+# key -> (expires_at, serialized value)
+_local: LRUCache = LRUCache(maxsize=10000)
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached value, or None on a miss."""
+    if _redis is not None:
+        raw = await _redis.get(key)
+        return orjson.loads(raw) if raw is not None else None
+
+    entry = _local.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _local.pop(key, None)
+        return None
+    return orjson.loads(entry[1])
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Store a value for ttl seconds."""
+    if _redis is not None:
+        await _redis.set(key, orjson.dumps(value), ex=ttl)
+    else:
+        _local[key] = (time.monotonic() + ttl, orjson.dumps(value))
+
+
+async def cache_pop(key: str) -> Optional[Any]:
+    """Atomically return and remove a value, or None on a miss."""
+    if _redis is not None:
+        raw = await _redis.getdel(key)
+        return orjson.loads(raw) if raw is not None else None
+
+    entry = _local.pop(key, None)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return orjson.loads(entry[1])
+
+
+async def cache_delete(*keys: str) -> None:
+    """Invalidate one or more keys."""
+    if _redis is not None:
+        if keys:
+            await _redis.delete(*keys)
+    else:
+        for key in keys:
+            _local.pop(key, None)
+
+
+async def close_cache() -> None:
+    """Close the Redis connection pool, if any."""
+    if _redis is not None:
+        await _redis.aclose()
@@ -2,18 +2,23 @@
 Pagination utilities for Lead Genius API.
 Provides consistent pagination across all list endpoints.
 """
-from typing import TypeVar, Generic, List, Optional
-from pydantic import BaseModel
+import uuid
+import base64
+from datetime import datetime
+from typing import TypeVar, Generic, List, Optional, Tuple
+from pydantic import BaseModel, Field
 from sqlmodel import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.exceptions import raise_validation_error
+
 T = TypeVar("T")
 
 
 class PaginationParams(BaseModel):
     """Pagination query parameters."""
-    page: int = 1
-    limit: int = 20
+    page: int = Field(1, gt=0)
+    limit: int = Field(20, gt=0)
     
     @property
     def offset(self) -> int:
@@ -52,12 +57,12 @@ def create_paginated_response(
         items: List of items for current page
         total: Total count of all items
         page: Current page number
-        limit: Items per page
+        limit: Items per page (>= 1)
     
     Returns:
         Dictionary with pagination metadata
     """
-    pages = (total + limit - 1) // limit if limit > 0 else 0
+    pages = -(-total // limit)  # ceil division
     
     return {
         "items": items,
@@ -90,17 +95,68 @@ async def paginate_query(
     Returns:
         Paginated response dictionary
     """
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await session.exec(count_query)
-    total = total_result.one()
-    
-    # Apply pagination
+    # Total comes back with each row via count(*) OVER (), computed
+    # before OFFSET/LIMIT, so one round-trip returns page and count
     offset = (page - 1) * limit
-    paginated_query = query.offset(offset).limit(limit)
+    paginated_query = (
+        query.add_columns(func.count().over().label("total"))
+        .offset(offset)
+        .limit(limit)
+    )
+    
+    # session.execute returns real (entity, total) rows; sqlmodel's exec
+    # would unwrap them to bare entities
+    result = await session.execute(paginated_query)
+    rows = result.all()
+    items = [row[0] for row in rows]
     
-    # Execute query
-    result = await session.exec(paginated_query)
-    items = result.all()
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # Past the last page: no rows to carry the count
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await session.exec(count_query)).one()
+    else:
+        total = 0
     
     return create_paginated_response(items, total, page, limit)
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor; rejects malformed cursors with a 422."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except ValueError:
+        raise_validation_error("Invalid cursor", "cursor")
+
+
+def create_cursor_response(items: List[T], limit: int) -> dict:
+    """
+    Create a keyset-paginated response dictionary.
+    
+    Args:
+        items: Up to limit + 1 rows ordered by (created_at, id) descending;
+            the extra row only signals that another page exists
+        limit: Items per page
+    
+    Returns:
+        Dictionary with the page and the cursor for the next one
+    """
+    has_next = len(items) > limit
+    items = items[:limit]
+    last = items[-1] if has_next else None
+    
+    return {
+        "items": items,
+        "limit": limit,
+        "has_next": has_next,
+        "next_cursor": encode_cursor(last.created_at, last.id) if last else None
+    }
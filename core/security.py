@@ -2,13 +2,18 @@
 Security utilities for Lead Genius API.
 Consolidated JWT and password handling.
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Literal
+import os
 import uuid
+import asyncio
+import hashlib
 import secrets
+from concurrent.futures import ProcessPoolExecutor
 
 import jwt
 import bcrypt
+from cachetools import TTLCache
 
 from backend.config import settings
 
@@ -23,13 +28,59 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_COST)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
+# bcrypt is CPU-bound for tens of ms per call; worker processes run it in
+# parallel across cores without blocking the event loop or holding the GIL.
+# Workers are spawned on first use.
+_BCRYPT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password, run in the bcrypt process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """get_password_hash, run in the bcrypt process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, get_password_hash, password)
+
+
+def close_password_pool() -> None:
+    """Shut down the bcrypt worker processes."""
+    _BCRYPT_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+# Recently rejected (email, password) pairs, so retried bad logins skip bcrypt.
+# Only failures are cached; a success is never memoized.
+_failed_logins: TTLCache = TTLCache(maxsize=10_000, ttl=10)
+
+
+def _login_attempt_key(email: str, password: str) -> tuple:
+    return (email, hashlib.sha256(password.encode('utf-8')).digest())
+
+
+def is_recent_failed_login(email: str, password: str) -> bool:
+    """Whether this exact email/password pair failed in the last few seconds."""
+    return _login_attempt_key(email, password) in _failed_logins
+
+
+def remember_failed_login(email: str, password: str) -> None:
+    """Record a rejected email/password pair."""
+    _failed_logins[_login_attempt_key(email, password)] = True
+
+
 
 # Token types
-TokenType = Literal["access", "refresh"]
+TokenType = Literal["access", "refresh", "oauth_state"]
+
+# Token lifetimes, fixed for the life of the process
+_ACCESS_DELTA = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_DELTA = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
 
 def create_token(
@@ -50,18 +101,15 @@ def create_token(
     """
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    elif token_type == "refresh":
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    if not expires_delta:
+        expires_delta = _REFRESH_DELTA if token_type == "refresh" else _ACCESS_DELTA
+    now = datetime.now(timezone.utc)
     
     to_encode.update({
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + expires_delta,
+        "iat": now,
         "type": token_type,
-        "jti": str(uuid.uuid4())  # Unique token ID for revocation
+        "jti": uuid.uuid4().hex  # Unique token ID for revocation
     })
     
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -112,6 +160,14 @@ def generate_secure_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest of a token, for storing and looking up opaque tokens."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def generate_verification_code(length: int = 6) -> str:
     """Generate a numeric verification code."""
-    return ''.join(secrets.choice('0123456789') for _ in range(length))
+    if length > 18:
+        return ''.join(secrets.choice('0123456789') for _ in range(length))
+    # One uniform draw, zero-padded to length digits
+    return f"{secrets.randbelow(10 ** length):0{length}d}"
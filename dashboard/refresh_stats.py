@@ -0,0 +1,21 @@
+"""
+Refreshes the dashboard_org_stats materialized view behind /api/dashboard/stats.
+Run periodically (every 1-5 minutes) from cron or a scheduler:
+
+    python -m backend.dashboard.refresh_stats
+
+CONCURRENTLY keeps the view readable while it is rebuilt.
+"""
+import asyncio
+from sqlalchemy import text
+from backend.database import engine
+
+REFRESH_DASHBOARD_STATS = text("REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_org_stats")
+
+async def refresh_dashboard_stats():
+    async with engine.begin() as conn:
+        await conn.execute(REFRESH_DASHBOARD_STATS)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(refresh_dashboard_stats())
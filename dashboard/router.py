@@ -1,55 +1,72 @@
 from fastapi import APIRouter, Depends
 from typing import List, Dict, Any
-from sqlmodel import Session, select, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import column, table
+from cachetools import TTLCache
 from backend.database import get_session
 from backend.auth.dependencies import get_current_user
 from backend.users.models import User
-from backend.leads.models import Lead
-from backend.campaigns.models import Campaign
 from backend.activity.models import ActivityLog
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+# Materialized view created in database.SCHEMA_UPDATES
+DASHBOARD_ORG_STATS = table(
+    "dashboard_org_stats",
+    column("org_id"),
+    column("total_leads"),
+    column("qualified_leads"),
+    column("active_campaigns"),
+)
+
+# Per-org stats for polling dashboard panels; the view itself only changes on refresh
+_stats_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+_CHART = {
+    "labels": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"],
+    "data": [38, 62, 24, 55, 32, 70]
+}
+
 @router.get("/stats")
 async def get_stats(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    # Total Leads
-    total_leads = session.exec(
-        select(func.count(Lead.id)).where(Lead.org_id == current_user.current_org_id)
-    ).one()
+    org_id = current_user.current_org_id
+    stats = _stats_cache.get(org_id)
+    if stats is not None:
+        return stats
     
-    # Qualified Leads (Example logic: score > 80 or status='qualified')
-    qualified_leads = session.exec(
-        select(func.count(Lead.id)).where(Lead.org_id == current_user.current_org_id, Lead.score >= 80)
-    ).one()
+    # One indexed row from the dashboard_org_stats roll-up (refreshed every few minutes)
+    statement = select(
+        DASHBOARD_ORG_STATS.c.total_leads,
+        DASHBOARD_ORG_STATS.c.qualified_leads,
+        DASHBOARD_ORG_STATS.c.active_campaigns
+    ).where(DASHBOARD_ORG_STATS.c.org_id == org_id)
+    row = (await session.exec(statement)).first()
+    # Orgs created since the last refresh have no row yet
+    total_leads, qualified_leads, active_campaigns = row or (0, 0, 0)
     
-    # Active Campaigns
-    active_campaigns = session.exec(
-        select(func.count(Campaign.id)).where(Campaign.org_id == current_user.current_org_id, Campaign.status == "active")
-    ).one()
-    
-    return {
+    stats = {
         "total_leads": total_leads,
         "qualified_leads": qualified_leads,
         "active_campaigns": active_campaigns,
         "response_rate": "4.2%", # Mock
         "pending_tasks": 8 # Mock
     }
+    _stats_cache[org_id] = stats
+    return stats
 
 @router.get("/activity", response_model=List[ActivityLog])
 async def get_activity(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     statement = select(ActivityLog).where(ActivityLog.org_id == current_user.current_org_id).order_by(ActivityLog.created_at.desc()).limit(10)
-    results = session.exec(statement)
+    results = await session.exec(statement)
     return results.all()
 
 @router.get("/chart")
 async def get_chart_data():
-    return {
-        "labels": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"],
-        "data": [38, 62, 24, 55, 32, 70]
-    }
+    return _CHART
@@ -2,14 +2,154 @@ from sqlmodel import SQLModel, create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 from .config import settings
 
 # Create Async Engine
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+# One engine (and pool) per process, shared by requests and background tasks
+if settings.DB_PGBOUNCER:
+    # PgBouncer owns pooling, and a server connection can change between
+    # transactions, so prepared statements can't be cached per connection
+    _pool_options = {"poolclass": NullPool}
+    _statement_cache_size = 0
+else:
+    _pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,  # Fail fast instead of queueing for 30s
+        "pool_pre_ping": True,  # Drop connections the server closed while idle
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_use_lifo": True,  # Reuse warm connections; lets surplus ones idle out
+    }
+    _statement_cache_size = settings.DB_STATEMENT_CACHE_SIZE
 
-# Set to True to recreate all tables (WARNING: deletes all data)
-RECREATE_TABLES = False  # Disabled to preserve data
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,  # Per-statement logging is costly on hot paths
+    future=True,
+    insertmanyvalues_page_size=1000,  # Rows per multi-VALUES INSERT in bulk ingest
+    connect_args={
+        # Keep hot statements (e.g. the per-request user lookup) prepared per connection
+        "prepared_statement_cache_size": _statement_cache_size,
+        "statement_cache_size": _statement_cache_size,
+    },
+    **_pool_options
+)
+
+# Session factory, built once: shared by get_session and code running
+# outside a request (background tasks, workers)
+async_session_maker = sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+
+# Drop and recreate the whole schema on startup (WARNING: deletes all data).
+# Only ever enabled explicitly via the RECREATE_TABLES env var.
+RECREATE_TABLES = settings.RECREATE_TABLES
+
+def _to_timestamptz(table: str, column: str) -> str:
+    """DDL converting a naive (UTC) timestamp column to timestamptz, once."""
+    return f"""
+    DO $$ BEGIN
+        IF (SELECT data_type FROM information_schema.columns
+            WHERE table_name = '{table}' AND column_name = '{column}') = 'timestamp without time zone' THEN
+            ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMPTZ USING {column} AT TIME ZONE 'UTC';
+        END IF;
+    END $$
+    """
+
+# Idempotent DDL applied on startup (for dev environment)
+SCHEMA_UPDATES = [
+    "ALTER TABLE lead ADD COLUMN IF NOT EXISTS profile_data JSONB DEFAULT '{}'::jsonb",
+    # Unique (campaign_id, linkedin_url) backs the Apify ingest upsert. Existing
+    # duplicates (e.g. from repeated mock runs) would make the index fail, so
+    # first keep only the newest lead per key, moving its siblings' interactions
+    # and messages onto it
+    """
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_class WHERE relname = 'ix_lead_campaign_linkedin_url') THEN
+            CREATE TEMP TABLE lead_dedupe AS
+            SELECT id, keep_id FROM (
+                SELECT id, first_value(id) OVER (
+                    PARTITION BY campaign_id, linkedin_url ORDER BY created_at DESC, id DESC
+                ) AS keep_id
+                FROM lead
+                WHERE campaign_id IS NOT NULL AND linkedin_url IS NOT NULL
+            ) ranked
+            WHERE id <> keep_id;
+            UPDATE lead_interaction t SET lead_id = d.keep_id FROM lead_dedupe d WHERE t.lead_id = d.id;
+            UPDATE outreach_message t SET lead_id = d.keep_id FROM lead_dedupe d WHERE t.lead_id = d.id;
+            DELETE FROM lead USING lead_dedupe d WHERE lead.id = d.id;
+            DROP TABLE lead_dedupe;
+            CREATE UNIQUE INDEX ix_lead_campaign_linkedin_url ON lead (campaign_id, linkedin_url);
+        END IF;
+    END $$
+    """,
+    # jsonb_path_ops GIN indexes for @> containment queries over raw Apify payloads
+    "CREATE INDEX IF NOT EXISTS ix_lead_profile_data_gin ON lead USING gin (profile_data jsonb_path_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_lead_interaction_raw_data_gin ON lead_interaction USING gin (raw_data jsonb_path_ops)",
+    # Timezone-aware timestamps (models write datetime.now(timezone.utc))
+    _to_timestamptz("activity_log", "created_at"),
+    _to_timestamptz("campaign_run", "created_at"),
+    _to_timestamptz("campaign_run", "completed_at"),
+    # Insert timestamps filled in by Postgres
+    "ALTER TABLE campaign_run ALTER COLUMN created_at SET DEFAULT now()",
+    "ALTER TABLE campaign ALTER COLUMN created_at SET DEFAULT timezone('utc', now())",
+    "ALTER TABLE campaign ALTER COLUMN updated_at SET DEFAULT timezone('utc', now())",
+    # Composite indexes for the extension queue, stats and message list paging
+    "CREATE INDEX IF NOT EXISTS ix_outreach_message_queue ON outreach_message (org_id, send_method, channel, status, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_outreach_message_extension_stats ON outreach_message (org_id, send_method, status)",
+    "CREATE INDEX IF NOT EXISTS ix_outreach_message_org_created ON outreach_message (org_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_outreach_message_lead_created ON outreach_message (lead_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_campaign_org_created ON campaign (org_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_lead_org_created ON lead (org_id, created_at, id)",
+    # Composites matching the org-scoped filters; they make the plain org_id indexes redundant
+    "CREATE INDEX IF NOT EXISTS ix_lead_org_score ON lead (org_id, score)",
+    "CREATE INDEX IF NOT EXISTS ix_lead_org_status ON lead (org_id, status)",
+    "CREATE INDEX IF NOT EXISTS ix_campaign_org_status ON campaign (org_id, status)",
+    "CREATE INDEX IF NOT EXISTS ix_activity_log_org_created ON activity_log (org_id, created_at DESC)",
+    "DROP INDEX IF EXISTS ix_lead_org_id",
+    "DROP INDEX IF EXISTS ix_campaign_org_id",
+    "DROP INDEX IF EXISTS ix_activity_log_org_id",
+    # Index-only (user_id, org_id) -> role lookup for the current user's membership
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_orgmember_user_org ON organization_member (user_id, org_id) INCLUDE (role)",
+    # Per-org dashboard roll-up, refreshed out of band (python -m backend.dashboard.refresh_stats);
+    # the unique index is required for REFRESH ... CONCURRENTLY
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_org_stats AS
+    SELECT o.id AS org_id,
+           coalesce(l.total_leads, 0) AS total_leads,
+           coalesce(l.qualified_leads, 0) AS qualified_leads,
+           coalesce(c.active_campaigns, 0) AS active_campaigns
+    FROM organization o
+    LEFT JOIN (
+        SELECT org_id, count(*) AS total_leads, count(*) FILTER (WHERE score >= 80) AS qualified_leads
+        FROM lead GROUP BY org_id
+    ) l ON l.org_id = o.id
+    LEFT JOIN (
+        SELECT org_id, count(*) AS active_campaigns
+        FROM campaign WHERE status = 'active' GROUP BY org_id
+    ) c ON c.org_id = o.id
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_dashboard_org_stats_org_id ON dashboard_org_stats (org_id)",
+    # Campaign settings filters: GIN for @> containment, partial index for the cloud scraper flag
+    "CREATE INDEX IF NOT EXISTS ix_campaign_settings_gin ON campaign USING gin (settings jsonb_path_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_campaign_cloud_scraper ON campaign ((settings->>'use_cloud_scraper')) WHERE (settings->>'use_cloud_scraper') = 'true'",
+    # LinkedIn webhooks update messages by linkedin_message_id
+    "CREATE INDEX IF NOT EXISTS ix_outreach_message_linkedin_message_id ON outreach_message (linkedin_message_id)",
+    # Apify webhooks look runs up by apify_run_id; upgrade the plain index to a unique one
+    """
+    DO $$ BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'ix_campaign_run_apify_run_id' AND i.indisunique
+        ) THEN
+            DROP INDEX IF EXISTS ix_campaign_run_apify_run_id;
+            CREATE UNIQUE INDEX ix_campaign_run_apify_run_id ON campaign_run (apify_run_id);
+        END IF;
+    END $$
+    """,
+]
 
 async def init_db():
     async with engine.begin() as conn:
@@ -20,18 +160,19 @@ async def init_db():
             await conn.execute(text("GRANT ALL ON SCHEMA public TO public"))
         await conn.run_sync(SQLModel.metadata.create_all)
         
-        # Schema Evolution: Add profile_data if missing (for dev environment)
-        try:
-            await conn.execute(text("ALTER TABLE lead ADD COLUMN IF NOT EXISTS profile_data JSONB DEFAULT '{}'::jsonb"))
-        except Exception as e:
-            # Ignore if generic error, but print
-            print(f"Migration warning: {e}")
+        # Schema Evolution: bring existing databases up to date with the models.
+        # create_all only creates missing tables, not columns/indexes on existing ones.
+        for statement in SCHEMA_UPDATES:
+            try:
+                # Savepoint so one failing statement doesn't abort the rest
+                async with conn.begin_nested():
+                    await conn.execute(text(statement))
+            except Exception as e:
+                # Ignore if generic error, but print
+                print(f"Migration warning: {e}")
 
 async def get_session() -> AsyncSession:
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
+    async with async_session_maker() as session:
         yield session
 
 
@@ -3,10 +3,17 @@ Lead Genius Backend - FastAPI Application
 Main entry point with all routes configured.
 """
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from backend.database import init_db
+from backend.core.cache import close_cache
+from backend.core.security import close_password_pool
+from backend.services.apify_service import apify_service
+from backend.services.apollo_service import apollo_service
+from backend.services.integrations.linkedin import close_http_client as close_linkedin_client
+from backend.services.task_queue import broker
 
 # Import all API routers
 from backend.api import auth, users, leads, campaigns, outreach, personas, scoring, dashboard, organizations, extension, linkedin, apify, analysis, enrichment
@@ -14,7 +21,7 @@ from backend.api import auth, users, leads, campaigns, outreach, personas, scori
 # Import models to ensure they are registered with SQLModel
 from backend.models import (
     User, Organization, OrganizationMember,
-    RefreshToken, PasswordResetToken, EmailVerificationToken,
+    RefreshToken, PasswordResetToken, EmailVerificationToken, ExtensionToken,
     Lead, Campaign,
     OutreachMessage, MessageTemplate,
     Persona, ScoringRule,
@@ -30,15 +37,25 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     # Startup
     await init_db()
+    if broker:
+        await broker.connect()  # Publish-only; workers consume via `faststream run`
     yield
     # Shutdown
+    if broker:
+        await broker.close()
+    await apify_service.close()
+    await apollo_service.close()
+    await close_linkedin_client()
+    await close_cache()
+    close_password_pool()
 
 
 app = FastAPI(
     title="Lead Genius API",
     description="AI-powered lead generation and intelligence platform",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # C-speed JSON encoding for every route
 )
 
 # CORS Configuration
@@ -1,6 +1,6 @@
 # Models package - normalized database models
 from backend.models.user import User, Organization, OrganizationMember
-from backend.models.token import RefreshToken, PasswordResetToken, EmailVerificationToken
+from backend.models.token import RefreshToken, PasswordResetToken, EmailVerificationToken, ExtensionToken
 from backend.models.lead import Lead
 from backend.models.campaign import Campaign
 from backend.models.outreach import OutreachMessage, MessageTemplate
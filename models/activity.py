@@ -3,11 +3,11 @@ Activity log model - audit trail for all actions.
 Enables analytics and debugging.
 """
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column
+from sqlalchemy import Column, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -17,10 +17,14 @@ class ActivityLog(SQLModel, table=True):
     Used for audit trail, analytics, and dashboard activity feed.
     """
     __tablename__ = "activity_log"
+    __table_args__ = (
+        # Activity feed: an org's most recent entries
+        Index("ix_activity_log_org_created", "org_id", text("created_at DESC")),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     # org_id is optional to support users without organizations (pre-setup)
-    org_id: Optional[uuid.UUID] = Field(default=None, foreign_key="organization.id", index=True)
+    org_id: Optional[uuid.UUID] = Field(default=None, foreign_key="organization.id")  # Indexed via ix_activity_log_org_created
     actor_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id", index=True)
     
     # Action details
@@ -32,7 +36,7 @@ class ActivityLog(SQLModel, table=True):
     description: Optional[str] = None
     
     # Additional metadata
-    meta_data: Dict[str, Any] = Field(default={}, sa_column=Column(JSONB))
+    meta_data: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
     # Example: {"old_status": "new", "new_status": "contacted", "lead_name": "John Doe"}
     
     # Request context (for debugging)
@@ -40,7 +44,10 @@ class ActivityLog(SQLModel, table=True):
     user_agent: Optional[str] = None
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=DateTime(timezone=True)
+    )
 
 
 # Action constants for consistency
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column
+from sqlalchemy import Column, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -16,8 +16,25 @@ class Campaign(SQLModel, table=True):
     Campaign entity - represents a lead generation campaign.
     Supports various types: social, group, search, csv.
     """
+    __table_args__ = (
+        # Keyset pagination of campaign lists, newest first
+        Index("ix_campaign_org_created", "org_id", "created_at", "id"),
+        # Org-scoped status filters (e.g. active campaign counts)
+        Index("ix_campaign_org_status", "org_id", "status"),
+        # Containment (@>) filters on settings
+        Index(
+            "ix_campaign_settings_gin", "settings",
+            postgresql_using="gin", postgresql_ops={"settings": "jsonb_path_ops"}
+        ),
+        # Campaigns with the cloud scraper explicitly enabled
+        Index(
+            "ix_campaign_cloud_scraper", text("(settings->>'use_cloud_scraper')"),
+            postgresql_where=text("(settings->>'use_cloud_scraper') = 'true'")
+        ),
+    )
+    
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    org_id: uuid.UUID = Field(foreign_key="organization.id", index=True)
+    org_id: uuid.UUID = Field(foreign_key="organization.id")  # Indexed via the org_id-leading composites
     
     # Basic info
     name: str = Field(index=True)
@@ -28,7 +45,7 @@ class Campaign(SQLModel, table=True):
     status: str = Field(default="draft", index=True)  # draft, active, paused, processing, completed, failed
     
     # Campaign settings (flexible JSONB)
-    settings: Dict[str, Any] = Field(default={}, sa_column=Column(JSONB))
+    settings: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
     # Example settings: {
     #   "keywords": ["software engineer"],
     #   "location": "San Francisco",
@@ -52,5 +69,12 @@ class Campaign(SQLModel, table=True):
     last_resumed_at: Optional[datetime] = None
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set by Postgres on insert (naive UTC, like the utcnow() writes elsewhere)
+    created_at: Optional[datetime] = Field(
+        default=None, nullable=False,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())")}
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None, nullable=False,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())")}
+    )
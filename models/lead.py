@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, List
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column
+from sqlalchemy import Column, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -16,8 +16,23 @@ class Lead(SQLModel, table=True):
     Lead entity - represents a potential customer/contact.
     Scoped to organization and optionally to a campaign.
     """
+    __table_args__ = (
+        # One lead per profile per campaign; target of the Apify ingest upsert
+        Index("ix_lead_campaign_linkedin_url", "campaign_id", "linkedin_url", unique=True),
+        # Keyset pagination of lead lists, newest first
+        Index("ix_lead_org_created", "org_id", "created_at", "id"),
+        # Org-scoped score (qualified counts, sorting) and status filters
+        Index("ix_lead_org_score", "org_id", "score"),
+        Index("ix_lead_org_status", "org_id", "status"),
+        # Containment (@>) lookups on the raw Apify profile
+        Index(
+            "ix_lead_profile_data_gin", "profile_data",
+            postgresql_using="gin", postgresql_ops={"profile_data": "jsonb_path_ops"}
+        ),
+    )
+    
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    org_id: uuid.UUID = Field(foreign_key="organization.id", index=True)
+    org_id: uuid.UUID = Field(foreign_key="organization.id")  # Indexed via the org_id-leading composites
     campaign_id: Optional[uuid.UUID] = Field(default=None, foreign_key="campaign.id", index=True)
     
     # Basic info
@@ -33,7 +48,7 @@ class Lead(SQLModel, table=True):
     mobile_phone: Optional[str] = None
     
     # Phone numbers (Apollo enrichment)
-    phone_numbers: List[dict] = Field(default=[], sa_column=Column(JSONB))
+    phone_numbers: List[dict] = Field(default_factory=list, sa_column=Column(JSONB, nullable=False, server_default=text("'[]'::jsonb")))
     # Example: [{"number": "+1234567890", "type": "mobile", "verified": true}]
     
     # Social
@@ -67,10 +82,10 @@ class Lead(SQLModel, table=True):
     apollo_credits_used: int = Field(default=0)
     
     # Tags for organization
-    tags: List[str] = Field(default=[], sa_column=Column(JSONB))
+    tags: List[str] = Field(default_factory=list, sa_column=Column(JSONB, nullable=False, server_default=text("'[]'::jsonb")))
     
     # Custom data (for flexibility)
-    custom_fields: dict = Field(default={}, sa_column=Column(JSONB))
+    custom_fields: dict = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
     
     # Notes
     notes: Optional[str] = None
@@ -81,11 +96,17 @@ class Lead(SQLModel, table=True):
     last_contacted_at: Optional[datetime] = None
 
     # Save Everything Strategy
-    profile_data: dict = Field(default={}, sa_type=JSONB) # Store full Apify profile object
+    profile_data: dict = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))) # Store full Apify profile object
 
 
 class LeadInteraction(SQLModel, table=True):
     __tablename__ = "lead_interaction"
+    __table_args__ = (
+        Index(
+            "ix_lead_interaction_raw_data_gin", "raw_data",
+            postgresql_using="gin", postgresql_ops={"raw_data": "jsonb_path_ops"}
+        ),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     lead_id: uuid.UUID = Field(foreign_key="lead.id", index=True)
@@ -97,4 +118,4 @@ class LeadInteraction(SQLModel, table=True):
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-    raw_data: dict = Field(default={}, sa_type=JSONB) # Full event data (reaction type, etc.)
+    raw_data: dict = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))) # Full event data (reaction type, etc.)
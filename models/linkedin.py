@@ -4,9 +4,12 @@ Supports both user-level and organization-level LinkedIn connections.
 """
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Relationship
+
+if TYPE_CHECKING:
+    from backend.models.user import User
 
 
 class LinkedInCredential(SQLModel, table=True):
@@ -44,6 +47,9 @@ class LinkedInCredential(SQLModel, table=True):
     
     # For org credentials, who connected it
     connected_by_user_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id")
+    connected_by: Optional["User"] = Relationship(
+        sa_relationship_kwargs={"foreign_keys": "[LinkedInCredential.connected_by_user_id]"}
+    )
     
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
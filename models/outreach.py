@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, List
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column
+from sqlalchemy import Column, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -28,7 +28,7 @@ class MessageTemplate(SQLModel, table=True):
     content: str
     
     # Variables available in template (e.g., ["name", "company", "title"])
-    variables: List[str] = Field(default=[], sa_column=Column(JSONB))
+    variables: List[str] = Field(default_factory=list, sa_column=Column(JSONB, nullable=False, server_default=text("'[]'::jsonb")))
     
     # Status
     is_active: bool = Field(default=True)
@@ -44,6 +44,15 @@ class OutreachMessage(SQLModel, table=True):
     Tracks status, scheduling, and send method (manual, extension, api).
     """
     __tablename__ = "outreach_message"
+    __table_args__ = (
+        # Extension queue: equality on org/method/channel/status, ordered by created_at
+        Index("ix_outreach_message_queue", "org_id", "send_method", "channel", "status", "created_at"),
+        # Extension stats: GROUP BY status within an org's extension messages
+        Index("ix_outreach_message_extension_stats", "org_id", "send_method", "status"),
+        # Keyset pagination of message lists, newest first
+        Index("ix_outreach_message_org_created", "org_id", "created_at", "id"),
+        Index("ix_outreach_message_lead_created", "lead_id", "created_at", "id"),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     org_id: uuid.UUID = Field(foreign_key="organization.id", index=True)
@@ -64,7 +73,7 @@ class OutreachMessage(SQLModel, table=True):
     
     # LinkedIn tracking (for API integration)
     linkedin_profile_url: Optional[str] = None
-    linkedin_message_id: Optional[str] = None  # ID from LinkedIn API
+    linkedin_message_id: Optional[str] = Field(default=None, index=True)  # ID from LinkedIn API, used by webhooks
     
     # Scheduling
     scheduled_at: Optional[datetime] = None
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column
+from sqlalchemy import Column, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -27,7 +27,7 @@ class Persona(SQLModel, table=True):
     priority: int = Field(default=1)  # 1-10
     
     # Matching rules (JSONB for flexibility)
-    rules_json: Dict[str, Any] = Field(default={}, sa_column=Column(JSONB))
+    rules_json: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
     # Example rules: {
     #   "title_keywords": ["manager", "director", "vp"],
     #   "title_exclude": ["intern", "junior"],
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column
+from sqlalchemy import Column, text
 from sqlalchemy.dialects.postgresql import JSONB
 import uuid
 
@@ -29,7 +29,7 @@ class LinkedInPost(SQLModel, table=True):
     total_likes: int = Field(default=0)
     
     # AI Insights
-    ai_insights: Dict[str, Any] = Field(default={}, sa_column=Column(JSONB))
+    ai_insights: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
     
     # Organization & Persona
     org_id: uuid.UUID = Field(foreign_key="organization.id", index=True)
@@ -69,7 +69,7 @@ class PostInteraction(SQLModel, table=True):
     profile_type: Optional[str] = None  # individual, company
     seniority_level: Optional[str] = None  # C-level, VP, Director, etc.
     role_category: Optional[str] = None  # decision_maker, influencer, end_user, irrelevant
-    ai_insights: Dict[str, Any] = Field(default={}, sa_column=Column(JSONB))
+    ai_insights: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
     
     # Link to Lead if converted
     lead_id: Optional[uuid.UUID] = Field(default=None, index=True)
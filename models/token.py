@@ -76,3 +76,21 @@ class EmailVerificationToken(SQLModel, table=True):
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     expires_at: datetime
+
+
+class ExtensionToken(SQLModel, table=True):
+    """
+    Long-lived token for the Chrome extension.
+    Only the SHA-256 hash is stored; the raw token is shown once at issue.
+    """
+    __tablename__ = "extension_token"
+    
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", index=True)
+    org_id: Optional[uuid.UUID] = Field(default=None, foreign_key="organization.id")
+    
+    token_hash: str = Field(unique=True, index=True)
+    
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
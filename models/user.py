@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
 
 from sqlmodel import SQLModel, Field, Relationship, Column
+from sqlalchemy import Index
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -48,6 +49,13 @@ class OrganizationMember(SQLModel, table=True):
     Allows users to belong to multiple organizations with different roles.
     """
     __tablename__ = "organization_member"
+    __table_args__ = (
+        # One membership per user per org; covers the per-request role lookup
+        Index(
+            "ix_orgmember_user_org", "user_id", "org_id",
+            unique=True, postgresql_include=["role"]
+        ),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id", index=True)
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column
+from sqlalchemy import Column, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -25,7 +25,7 @@ class Webhook(SQLModel, table=True):
     secret: str  # For signature verification
     
     # Events to subscribe to
-    events: List[str] = Field(default=[], sa_column=Column(JSONB))
+    events: List[str] = Field(default_factory=list, sa_column=Column(JSONB, nullable=False, server_default=text("'[]'::jsonb")))
     # Example: ["lead.created", "lead.enriched", "campaign.completed"]
     
     # Status
@@ -48,7 +48,7 @@ class WebhookDelivery(SQLModel, table=True):
     
     # Event info
     event: str
-    payload: Dict[str, Any] = Field(default={}, sa_column=Column(JSONB))
+    payload: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
     
     # Delivery status
     status: str = Field(default="pending")  # pending, success, failed
@@ -1,7 +1,7 @@
 import uuid
 from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column
+from sqlalchemy import Column, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 class Persona(SQLModel, table=True):
@@ -10,4 +10,4 @@ class Persona(SQLModel, table=True):
     name: str
     
     # Store rules as JSON
-    rules_json: Dict[str, Any] = Field(default={}, sa_column=Column(JSONB))
+    rules_json: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")))
@@ -2,12 +2,12 @@
 Lead repository with search and bulk operations.
 """
 import uuid
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from datetime import datetime
 
 from sqlmodel import select, or_, and_
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 from backend.models.lead import Lead
 from backend.repositories.base import BaseRepository
@@ -63,18 +63,30 @@ class LeadRepository(BaseRepository[Lead]):
                 for tag in filters.tags:
                     query = query.where(Lead.tags.contains([tag]))
         
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.session.exec(count_query)
-        total = total_result.one()
-        
-        # Apply ordering and pagination
-        query = query.order_by(Lead.created_at.desc())
+        # Page rows and the total in one round-trip: COUNT(*) OVER () is
+        # evaluated before LIMIT/OFFSET, so every row carries the full count
         offset = (page - 1) * limit
-        query = query.offset(offset).limit(limit)
+        page_query = (
+            query.add_columns(func.count().over().label("total"))
+            .order_by(Lead.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+        )
         
-        result = await self.session.exec(query)
-        items = result.all()
+        # session.execute, not exec: sqlmodel's exec would unwrap each
+        # (Lead, total) row to the bare Lead and drop the count
+        result = await self.session.execute(page_query)
+        rows = result.all()
+        items = [row[0] for row in rows]
+        
+        if rows:
+            total = rows[0].total
+        elif offset == 0:
+            total = 0
+        else:
+            # Page past the end: no row to read the count from
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await self.session.exec(count_query)).one()
         
         return create_paginated_response(items, total, page, limit)
     
@@ -122,6 +134,26 @@ class LeadRepository(BaseRepository[Lead]):
             return True
         return False
     
+    async def get_many(self, org_id: uuid.UUID, lead_ids: List[uuid.UUID]) -> List[Lead]:
+        """Get the org's leads among lead_ids in one query."""
+        query = select(Lead).where(Lead.org_id == org_id, Lead.id.in_(lead_ids))
+        result = await self.session.exec(query)
+        return result.all()
+    
+    async def update_scores(self, scores: List[dict]) -> None:
+        """
+        Bulk update scores from {"id": ..., "score": ...} rows.
+        One executemany UPDATE keyed on primary key, one commit.
+        """
+        if not scores:
+            return
+        now = datetime.utcnow()
+        await self.session.execute(
+            update(Lead),
+            [{**row, "updated_at": now} for row in scores]
+        )
+        await self.session.commit()
+    
     async def update_status(self, lead_id: uuid.UUID, status: str) -> bool:
         """Update lead status."""
         lead = await self.get(lead_id)
@@ -233,8 +265,13 @@ class LeadRepository(BaseRepository[Lead]):
             "by_status": status_counts
         }
     
-    async def export(self, org_id: uuid.UUID, filters: Optional[LeadFilter] = None) -> List[Lead]:
-        """Export all leads matching filters."""
+    async def stream_export(
+        self,
+        org_id: uuid.UUID,
+        filters: Optional[LeadFilter] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Lead]]:
+        """Yield all leads matching filters, in batches from a server-side cursor."""
         query = select(Lead).where(Lead.org_id == org_id)
         
         if filters:
@@ -243,6 +280,7 @@ class LeadRepository(BaseRepository[Lead]):
             if filters.campaign_id:
                 query = query.where(Lead.campaign_id == filters.campaign_id)
         
-        query = query.order_by(Lead.created_at.desc())
-        result = await self.session.exec(query)
-        return result.all()
+        query = query.order_by(Lead.created_at.desc()).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(query)
+        async for batch in result.partitions():
+            yield batch
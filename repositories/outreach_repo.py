@@ -7,11 +7,11 @@ from datetime import datetime
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 
 from backend.models.outreach import OutreachMessage, MessageTemplate
 from backend.repositories.base import BaseRepository
-from backend.core.pagination import create_paginated_response
+from backend.core.pagination import create_paginated_response, create_cursor_response, decode_cursor
 
 
 class OutreachMessageRepository(BaseRepository[OutreachMessage]):
@@ -48,6 +48,38 @@ class OutreachMessageRepository(BaseRepository[OutreachMessage]):
         
         return create_paginated_response(items, total, page, limit)
     
+    async def list_after(
+        self,
+        org_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        lead_id: Optional[uuid.UUID] = None,
+        status: Optional[str] = None
+    ) -> dict:
+        """
+        Keyset-paginated messages, newest first.
+        Seeks past the cursor's (created_at, id) instead of using OFFSET,
+        so deep pages cost the same as the first.
+        """
+        query = select(OutreachMessage).where(OutreachMessage.org_id == org_id)
+        if lead_id:
+            query = query.where(OutreachMessage.lead_id == lead_id)
+        if status:
+            query = query.where(OutreachMessage.status == status)
+        if cursor:
+            created_at, message_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(OutreachMessage.created_at, OutreachMessage.id) < tuple_(created_at, message_id)
+            )
+        
+        query = query.order_by(
+            OutreachMessage.created_at.desc(),
+            OutreachMessage.id.desc()
+        ).limit(limit + 1)
+        
+        result = await self.session.exec(query)
+        return create_cursor_response(result.all(), limit)
+    
     async def get_scheduled(self, org_id: uuid.UUID) -> List[OutreachMessage]:
         """Get all scheduled messages that are due."""
         query = select(OutreachMessage).where(
@@ -26,6 +26,19 @@ class ScoringRuleRepository(BaseRepository[ScoringRule]):
         result = await self.session.exec(query)
         return result.all()
     
+    async def list_as_dicts(self, org_id: uuid.UUID, active_only: bool = True) -> List[dict]:
+        """
+        Rules as plain column dicts, for read-only list responses.
+        Skips building ORM instances and re-validating them on the way out.
+        """
+        query = ScoringRule.__table__.select().where(ScoringRule.org_id == org_id)
+        if active_only:
+            query = query.where(ScoringRule.is_active == True).order_by(ScoringRule.priority.desc())
+        else:
+            query = query.order_by(ScoringRule.created_at.desc())
+        result = await self.session.execute(query)
+        return [dict(row) for row in result.mappings()]
+    
     async def create_defaults(self, org_id: uuid.UUID) -> List[ScoringRule]:
         """Create default scoring rules for a new organization."""
         rules = []
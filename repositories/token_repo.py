@@ -5,15 +5,27 @@ import uuid
 from typing import Optional
 from datetime import datetime, timedelta
 
+from sqlalchemy import delete
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from backend.models.token import RefreshToken, PasswordResetToken, EmailVerificationToken
+from backend.core.cache import cache_delete
+from backend.models.token import RefreshToken, PasswordResetToken, EmailVerificationToken, ExtensionToken
 from backend.repositories.base import BaseRepository
 from backend.config import settings
 from backend.core.security import generate_secure_token
 
 
+# Extension token lookups (hash -> user id) are cached by get_extension_user.
+# Entries are kept short so a revocation also reaches workers whose
+# in-process cache it could not clear.
+EXTENSION_TOKEN_CACHE_TTL = 300
+
+
+def extension_token_cache_key(token_hash: str) -> str:
+    return f"ext_tok:{token_hash}"
+
+
 class RefreshTokenRepository(BaseRepository[RefreshToken]):
     """Repository for RefreshToken operations."""
     
@@ -183,3 +195,24 @@ class EmailVerificationTokenRepository(BaseRepository[EmailVerificationToken]):
             await self.session.commit()
             return True
         return False
+
+
+class ExtensionTokenRepository(BaseRepository[ExtensionToken]):
+    """Repository for ExtensionToken operations."""
+    
+    def __init__(self, session: AsyncSession):
+        super().__init__(ExtensionToken, session)
+    
+    async def revoke_all_for_user(self, user_id: uuid.UUID) -> int:
+        """Delete all extension tokens of a user and drop their cached lookups."""
+        result = await self.session.execute(
+            delete(ExtensionToken)
+            .where(ExtensionToken.user_id == user_id)
+            .returning(ExtensionToken.token_hash)
+        )
+        token_hashes = result.scalars().all()
+        await self.session.commit()
+        
+        for token_hash in token_hashes:
+            await cache_delete(extension_token_cache_key(token_hash))
+        return len(token_hashes)
@@ -6,19 +6,41 @@ import uuid
 from typing import Optional, List
 from datetime import datetime
 
+from sqlalchemy.orm import joinedload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from backend.core.cache import cache_delete
 from backend.models.user import User, Organization, OrganizationMember
 from backend.repositories.base import BaseRepository
 
 
+# Authenticated users are cached in Redis (minus password_hash, plus their role
+# in the current org) by get_current_user; every user or membership write below
+# drops the entry so changes show up immediately
+USER_CACHE_TTL = 300
+
+
+def user_cache_key(user_id: uuid.UUID) -> str:
+    return f"user:{user_id}"
+
+
 class UserRepository(BaseRepository[User]):
     """Repository for User operations."""
     
     def __init__(self, session: AsyncSession):
         super().__init__(User, session)
     
+    async def forget_cached(self, user_id: uuid.UUID) -> None:
+        """Drop the cached copy of a user after it changes."""
+        await cache_delete(user_cache_key(user_id))
+    
+    async def update(self, id: uuid.UUID, obj_in: dict) -> Optional[User]:
+        """Update a user and invalidate its cached copy."""
+        user = await super().update(id, obj_in)
+        await self.forget_cached(id)
+        return user
+    
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         query = select(User).where(User.email == email)
@@ -89,6 +111,7 @@ class UserRepository(BaseRepository[User]):
             user.last_login_at = datetime.utcnow()
             self.session.add(user)
             await self.session.commit()
+            await self.forget_cached(user_id)
     
     async def verify_email(self, user_id: uuid.UUID) -> bool:
         """Mark user as verified."""
@@ -98,6 +121,7 @@ class UserRepository(BaseRepository[User]):
             user.updated_at = datetime.utcnow()
             self.session.add(user)
             await self.session.commit()
+            await self.forget_cached(user_id)
             return True
         return False
     
@@ -120,6 +144,7 @@ class UserRepository(BaseRepository[User]):
             user.updated_at = datetime.utcnow()
             self.session.add(user)
             await self.session.commit()
+            await self.forget_cached(user_id)
             return True
         return False
 
@@ -159,7 +184,8 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
     async def get_user_memberships(
         self, 
         user_id: uuid.UUID, 
-        active_only: bool = True
+        active_only: bool = True,
+        with_organization: bool = False
     ) -> List[OrganizationMember]:
         """Get all organizations a user belongs to."""
         query = select(OrganizationMember).where(
@@ -167,13 +193,16 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
         )
         if active_only:
             query = query.where(OrganizationMember.is_active == True)
+        if with_organization:
+            query = query.options(joinedload(OrganizationMember.organization))
         result = await self.session.exec(query)
         return list(result.all())
     
     async def get_org_members(
         self, 
         org_id: uuid.UUID, 
-        active_only: bool = True
+        active_only: bool = True,
+        with_user: bool = False
     ) -> List[OrganizationMember]:
         """Get all members of an organization."""
         query = select(OrganizationMember).where(
@@ -181,6 +210,8 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
         )
         if active_only:
             query = query.where(OrganizationMember.is_active == True)
+        if with_user:
+            query = query.options(joinedload(OrganizationMember.user))
         result = await self.session.exec(query)
         return list(result.all())
     
@@ -201,6 +232,7 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
         self.session.add(membership)
         await self.session.commit()
         await self.session.refresh(membership)
+        await cache_delete(user_cache_key(user_id))
         return membership
     
     async def update_role(
@@ -214,6 +246,7 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
             membership.role = new_role
             self.session.add(membership)
             await self.session.commit()
+            await cache_delete(user_cache_key(membership.user_id))
             return True
         return False
     
@@ -224,6 +257,7 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
             membership.is_active = False
             self.session.add(membership)
             await self.session.commit()
+            await cache_delete(user_cache_key(membership.user_id))
             return True
         return False
     
@@ -1,11 +1,14 @@
 import asyncio
 from sqlmodel import SQLModel
+from sqlalchemy import text
 from backend.database import engine
 
 async def reset_db():
     print("Resetting database...")
     async with engine.begin() as conn:
         print("Dropping all tables...")
+        # Views built on the tables would block DROP TABLE
+        await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS dashboard_org_stats"))
         await conn.run_sync(SQLModel.metadata.drop_all)
         print("Creating all tables...")
         await conn.run_sync(SQLModel.metadata.create_all)
@@ -427,7 +427,7 @@ class AnalysisService:
         Triggers Apollo enrichment for a lead (async call).
         """
         try:
-            from backend.services.apollo_service import apollo_service
+            from backend.services.apollo_service import apollo_service, split_name
             
             async with self.async_session_maker() as session:
                 lead = await session.get(Lead, lead_id)
@@ -435,10 +435,11 @@ class AnalysisService:
                     return
                 
                 # Call Apollo API
-                result = apollo_service.enrich_person(
+                first_name, last_name = split_name(lead.name)
+                result = await apollo_service.enrich_person(
                     linkedin_url=lead.linkedin_url,
-                    first_name=lead.name.split()[0] if lead.name else None,
-                    last_name=" ".join(lead.name.split()[1:]) if lead.name and len(lead.name.split()) > 1 else None,
+                    first_name=first_name,
+                    last_name=last_name,
                     company_name=lead.company
                 )
                 
@@ -456,12 +457,13 @@ class AnalysisService:
                         lead.phone_numbers = contact_info["all_phones"]
                     
                     lead.enrichment_status = "enriched"
-                    lead.enriched_at = datetime.utcnow()
-                    lead.apollo_enriched_at = datetime.utcnow()
+                    now = datetime.utcnow()
+                    lead.enriched_at = now
+                    lead.apollo_enriched_at = now
                     lead.apollo_match_confidence = contact_info["confidence"]
                     lead.apollo_credits_used = result.get("credits_used", 1)
                     
-                    session.add(lead)
+                    # lead came from session.get and is already tracked; no add() needed
                     await session.commit()
                     logger.info(f"Auto-enriched lead {lead_id} via Apollo (score: {lead.score})")
                 else:
@@ -1,15 +1,31 @@
 from apify_client import ApifyClient
+from typing import AsyncIterator, Optional
 from backend.config import settings
+import base64
+import httpx
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Items fetched per request when paging through a dataset
+DATASET_PAGE_SIZE = 1000
+
 class ApifyService:
     def __init__(self):
         self.client = ApifyClient(settings.APIFY_API_TOKEN)
         self.webhook_url = f"{settings.BACKEND_URL}{settings.API_PREFIX}/ingest/apify/webhook"
+        # Shared keep-alive client for actor runs and dataset reads;
+        # every request reuses a warm (HTTP/2) connection
+        self.http = httpx.AsyncClient(
+            base_url="https://api.apify.com",
+            headers={"Authorization": f"Bearer {settings.APIFY_API_TOKEN}"},
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30
+        )
 
-    def run_actor(self, actor_id: str, run_input: dict, webhook_url: str = None):
+    async def run_actor(self, actor_id: str, run_input: dict, webhook_url: str = None):
         """
         Triggers an Apify Actor run with the given input.
         Registers a webhook to call back our backend when the run finishes.
@@ -26,14 +42,17 @@ class ApifyService:
                 }
             ]
 
-            logger.info(f"Starting Apify actor {actor_id} with webhook {self.webhook_url}")
+            logger.info(f"Starting Apify actor {actor_id} with webhook {target_url}")
             
-            # Start the actor and don't wait for it to finish (asynchronously)
-            run = self.client.actor(actor_id).call(
-                run_input=run_input,
-                webhooks=webhooks,
-                wait_secs=0 # Return immediately
+            # Start the actor and don't wait for it to finish
+            response = await self.http.post(
+                f"/v2/acts/{actor_id.replace('/', '~')}/runs",
+                content=orjson.dumps(run_input),
+                headers={"Content-Type": "application/json"},
+                params={"webhooks": base64.b64encode(orjson.dumps(webhooks)).decode("ascii")}
             )
+            response.raise_for_status()
+            run = orjson.loads(response.content)["data"]
             
             return {
                 "success": True,
@@ -97,23 +116,37 @@ class ApifyService:
             logger.error(f"Failed to call Apify actor {actor_id}: {str(e)}")
             return None
 
+    async def iter_dataset_items(self, dataset_id: str, offset: int = 0) -> AsyncIterator[dict]:
+        """
+        Yields dataset items one page at a time over the shared HTTP client,
+        so callers never hold more than a page of the dataset in memory.
+        Starts at item `offset` (e.g. to resume a partially ingested dataset).
+        """
+        while True:
+            response = await self.http.get(
+                f"/v2/datasets/{dataset_id}/items",
+                params={"offset": offset, "limit": DATASET_PAGE_SIZE, "clean": "true"}
+            )
+            response.raise_for_status()
+            page = orjson.loads(response.content)
+            for item in page:
+                yield item
+            if len(page) < DATASET_PAGE_SIZE:
+                return
+            offset += DATASET_PAGE_SIZE
+
     async def get_dataset_items_async(self, dataset_id: str):
         """
-        Retrieves the results from a dataset asynchronously (wrapping sync client).
+        Retrieves the results from a dataset asynchronously.
         """
-        import asyncio
-        
-        loop = asyncio.get_running_loop()
-        
-        def _fetch():
-            dataset_client = self.client.dataset(dataset_id)
-            return dataset_client.list_items().items
-            
         try:
-            items = await loop.run_in_executor(None, _fetch)
-            return items
+            return [item async for item in self.iter_dataset_items(dataset_id)]
         except Exception as e:
             logger.error(f"Failed to fetch dataset {dataset_id}: {str(e)}")
             return []
 
+    async def close(self):
+        """Close the shared HTTP client."""
+        await self.http.aclose()
+
 apify_service = ApifyService()
@@ -1,10 +1,29 @@
-import requests
+import httpx
+import hashlib
 import logging
 from typing import Optional, Dict, Any, List
 from backend.config import settings
+from backend.core.cache import cache_get, cache_set
 
 logger = logging.getLogger(__name__)
 
+# Matched people are reused for a week instead of spending another credit
+PERSON_CACHE_TTL = 7 * 24 * 60 * 60
+
+def _person_cache_key(linkedin_url: Optional[str], email: Optional[str]) -> Optional[str]:
+    """Cache key from the person's canonical identifier, if there is one."""
+    identifier = linkedin_url or (email.lower() if email else None)
+    if not identifier:
+        return None
+    return f"apollo:{hashlib.sha1(identifier.encode('utf-8')).hexdigest()}"
+
+def split_name(name: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    """Split a full name into (first_name, last_name) for Apollo matching."""
+    parts = name.split() if name else []
+    first_name = parts[0] if parts else None
+    last_name = " ".join(parts[1:]) if len(parts) > 1 else None
+    return first_name, last_name
+
 class ApolloService:
     """
     Apollo.io enrichment service for extracting verified emails and phone numbers.
@@ -18,8 +37,17 @@ class ApolloService:
             "Content-Type": "application/json",
             "Cache-Control": "no-cache"
         }
+        # Shared async client for every Apollo call: one keep-alive pool, and HTTP/2
+        # multiplexes concurrent bulk requests over the same TLS connection
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
     
-    def enrich_person(
+    async def enrich_person(
         self,
         linkedin_url: Optional[str] = None,
         email: Optional[str] = None,
@@ -57,6 +85,12 @@ class ApolloService:
             logger.warning("Apollo API key not configured")
             return {"success": False, "error": "API key not configured"}
         
+        cache_key = _person_cache_key(linkedin_url, email)
+        if cache_key:
+            cached = await cache_get(cache_key)
+            if cached:
+                return {"success": True, "person": cached, "credits_used": 0}
+        
         # Build request payload
         payload = {
             "api_key": self.api_key,
@@ -79,9 +113,8 @@ class ApolloService:
             payload["domain"] = company_domain
         
         try:
-            response = requests.post(
-                f"{self.base_url}/people/match",
-                headers=self.headers,
+            response = await self.http.post(
+                "/people/match",
                 json=payload,
                 timeout=30
             )
@@ -91,6 +124,8 @@ class ApolloService:
                 person = data.get("person")
                 
                 if person:
+                    if cache_key:
+                        await cache_set(cache_key, person, PERSON_CACHE_TTL)
                     return {
                         "success": True,
                         "person": person,
@@ -127,7 +162,7 @@ class ApolloService:
                     "error": f"API error: {response.status_code}"
                 }
         
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error("Apollo API timeout")
             return {"success": False, "error": "Request timeout"}
         
@@ -135,7 +170,7 @@ class ApolloService:
             logger.error(f"Apollo enrichment failed: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def bulk_enrich(self, people: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def bulk_enrich(self, people: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Enrich up to 10 people at once.
         
@@ -163,9 +198,8 @@ class ApolloService:
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/people/bulk_match",
-                headers=self.headers,
+            response = await self.http.post(
+                "/people/bulk_match",
                 json=payload,
                 timeout=60
             )
@@ -247,5 +281,9 @@ class ApolloService:
         result["confidence"] = min(confidence, 1.0)
         
         return result
+    
+    async def close(self):
+        """Close the shared HTTP client."""
+        await self.http.aclose()
 
 apollo_service = ApolloService()
@@ -9,8 +9,10 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.config import settings
 from backend.core.security import (
-    get_password_hash, 
-    verify_password, 
+    aget_password_hash, 
+    averify_password, 
+    is_recent_failed_login,
+    remember_failed_login,
     create_access_token, 
     create_refresh_token,
     verify_token,
@@ -26,7 +28,8 @@ from backend.repositories.user_repo import UserRepository, OrganizationRepositor
 from backend.repositories.token_repo import (
     RefreshTokenRepository, 
     PasswordResetTokenRepository,
-    EmailVerificationTokenRepository
+    EmailVerificationTokenRepository,
+    ExtensionTokenRepository
 )
 from backend.repositories.activity_repo import ActivityLogRepository
 from backend.models.user import User, Organization
@@ -44,6 +47,7 @@ class AuthService:
         self.refresh_token_repo = RefreshTokenRepository(session)
         self.password_reset_repo = PasswordResetTokenRepository(session)
         self.email_verification_repo = EmailVerificationTokenRepository(session)
+        self.extension_token_repo = ExtensionTokenRepository(session)
         self.activity_repo = ActivityLogRepository(session)
         self.email_service = get_email_service()
     
@@ -61,7 +65,7 @@ class AuthService:
             raise_already_exists("User", "email", email)
         
         # Hash password
-        password_hash = get_password_hash(password)
+        password_hash = await aget_password_hash(password)
         
         # Create user with or without org based on org_name
         org = None
@@ -125,13 +129,19 @@ class AuthService:
         ip_address: Optional[str] = None
     ) -> dict:
         """Authenticate user and return tokens."""
+        # Repeat of a pair that just failed: reject before hitting the DB or bcrypt
+        if is_recent_failed_login(email, password):
+            raise_unauthorized("Incorrect email or password")
+        
         # Get user
         user = await self.user_repo.get_by_email(email)
         if not user:
+            remember_failed_login(email, password)
             raise_unauthorized("Incorrect email or password")
         
         # Verify password
-        if not verify_password(password, user.password_hash):
+        if not await averify_password(password, user.password_hash):
+            remember_failed_login(email, password)
             raise_unauthorized("Incorrect email or password")
         
         # Check if active
@@ -221,7 +231,8 @@ class AuthService:
         return False
     
     async def logout_all(self, user_id: uuid.UUID) -> int:
-        """Logout from all devices by revoking all refresh tokens."""
+        """Logout from all devices by revoking all refresh and extension tokens."""
+        await self.extension_token_repo.revoke_all_for_user(user_id)
         return await self.refresh_token_repo.revoke_all_for_user(user_id)
     
     async def forgot_password(self, email: str) -> dict:
@@ -259,14 +270,15 @@ class AuthService:
             raise_validation_error("Invalid or expired reset token")
         
         # Update password
-        password_hash = get_password_hash(new_password)
+        password_hash = await aget_password_hash(new_password)
         await self.user_repo.update_password(reset_token.user_id, password_hash)
         
         # Mark token as used
         await self.password_reset_repo.mark_used(reset_token.id)
         
-        # Revoke all refresh tokens for security
+        # Revoke all refresh and extension tokens for security
         await self.refresh_token_repo.revoke_all_for_user(reset_token.user_id)
+        await self.extension_token_repo.revoke_all_for_user(reset_token.user_id)
         
         # Log activity
         user = await self.user_repo.get(reset_token.user_id)
@@ -348,12 +360,18 @@ class AuthService:
         if not user:
             raise_not_found("User")
         
+        # The request's current user is loaded without password_hash
+        await self.user_repo.session.refresh(user, ["password_hash"])
+        
         # Verify current password
-        if not verify_password(current_password, user.password_hash):
+        if not await averify_password(current_password, user.password_hash):
             raise_unauthorized("Current password is incorrect")
         
         # Update password
-        password_hash = get_password_hash(new_password)
+        password_hash = await aget_password_hash(new_password)
         await self.user_repo.update_password(user_id, password_hash)
         
+        # Extension tokens were issued under the old password
+        await self.extension_token_repo.revoke_all_for_user(user_id)
+        
         return True
@@ -6,6 +6,7 @@ Note: Requires LinkedIn Developer Account and Sales Navigator subscription.
 """
 import uuid
 import httpx
+from functools import lru_cache
 from datetime import datetime
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
@@ -29,10 +30,32 @@ class LinkedInConfig(BaseModel):
     has_sales_navigator: bool = False
 
 
+@lru_cache(maxsize=1)
+def linkedin_config() -> LinkedInConfig:
+    """OAuth app configuration from settings, built once per process."""
+    return LinkedInConfig(
+        client_id=settings.LINKEDIN_CLIENT_ID,
+        client_secret=settings.LINKEDIN_CLIENT_SECRET,
+        redirect_uri=f"{settings.BACKEND_URL}/api/linkedin/callback"
+    )
+
+
 # =============================================================================
 # LINKEDIN API CLIENT
 # =============================================================================
 
+# One keep-alive pool shared by every client instance; closed on app shutdown
+http_client = httpx.AsyncClient(
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared LinkedIn connection pool."""
+    await http_client.aclose()
+
+
 class LinkedInAPIClient:
     """
     LinkedIn API client for sending messages.
@@ -50,9 +73,13 @@ class LinkedInAPIClient:
     BASE_URL = "https://api.linkedin.com/v2"
     AUTH_URL = "https://www.linkedin.com/oauth/v2"
     
-    def __init__(self, access_token: Optional[str] = None):
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         self.access_token = access_token
-        self.client = httpx.AsyncClient()
+        self.client = client or http_client
     
     @property
     def headers(self) -> Dict[str, str]:
@@ -219,10 +246,6 @@ class LinkedInAPIClient:
             "success": response.status_code in [200, 201],
             "status_code": response.status_code
         }
-    
-    async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
 
 
 # =============================================================================
@@ -235,8 +258,12 @@ class LinkedInService:
     Wraps the API client with business logic.
     """
     
-    def __init__(self, access_token: Optional[str] = None):
-        self.client = LinkedInAPIClient(access_token)
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.client = LinkedInAPIClient(access_token, client)
     
     async def send_outreach_message(
         self,
@@ -288,10 +315,6 @@ class LinkedInService:
                 return parts[1].strip("/").split("?")[0]
         
         return None
-    
-    async def close(self):
-        """Cleanup resources."""
-        await self.client.close()
 
 
 # =============================================================================
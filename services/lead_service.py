@@ -4,12 +4,15 @@ Lead service - lead management with scoring.
 import uuid
 import csv
 import io
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, TextIO
 from datetime import datetime
 
+from sqlalchemy import insert
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.core.exceptions import raise_not_found, raise_forbidden
+from backend.database import async_session_maker
 from backend.repositories.lead_repo import LeadRepository
 from backend.repositories.activity_repo import ActivityLogRepository
 from backend.repositories.persona_repo import PersonaRepository
@@ -19,6 +22,15 @@ from backend.models.activity import Actions
 from backend.schemas.lead import LeadCreate, LeadUpdate, LeadFilter, LeadImportResponse
 
 
+# Rows validated and inserted per round-trip during CSV import
+IMPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = [
+    "name", "linkedin_url", "email", "title", "company",
+    "location", "score", "status", "source", "created_at"
+]
+
+
 class LeadService:
     """Service for lead operations."""
     
@@ -212,17 +224,62 @@ class LeadService:
         self,
         org_id: uuid.UUID,
         user_id: uuid.UUID,
-        csv_content: str,
+        csv_file: TextIO,
         campaign_id: Optional[uuid.UUID] = None,
         tags: Optional[List[str]] = None
     ) -> LeadImportResponse:
-        """Import leads from CSV content."""
-        reader = csv.DictReader(io.StringIO(csv_content))
+        """
+        Import leads from a CSV text stream.
+        Rows are parsed lazily and inserted IMPORT_BATCH_SIZE at a time.
+        """
+        reader = csv.DictReader(csv_file)
+        
+        # Scoring inputs are the same for every row; load and compile them once
+        rules = _compile_rules(await self.scoring_repo.get_active(org_id))
+        personas = _compile_personas(await self.persona_repo.get_active(org_id))
         
         imported = 0
         failed = 0
         errors = []
-        
+        seen_urls = set()
+        
+        async def flush(batch: List[tuple]) -> None:
+            nonlocal imported, failed
+            # One duplicate check per batch instead of one query per row
+            urls = [lead.linkedin_url for _, lead in batch]
+            result = await self.session.exec(
+                select(Lead.linkedin_url).where(
+                    Lead.org_id == org_id,
+                    Lead.linkedin_url.in_(urls)
+                )
+            )
+            existing = set(result.all())
+            
+            rows = []
+            row_nums = []
+            for row_num, lead in batch:
+                if lead.linkedin_url in existing:
+                    failed += 1
+                    errors.append({"row": row_num, "error": "Duplicate LinkedIn URL"})
+                    continue
+                lead.score = self._score_lead(lead, rules, personas)
+                rows.append(lead.model_dump())
+                row_nums.append(row_num)
+            
+            if not rows:
+                return
+            try:
+                await self.session.execute(insert(Lead), rows)
+                await self.session.commit()
+            except Exception as e:
+                # A bad row fails its whole batch, not the whole upload
+                await self.session.rollback()
+                failed += len(rows)
+                errors.extend({"row": row_num, "error": str(e)} for row_num in row_nums)
+                return
+            imported += len(rows)
+        
+        batch = []
         for row_num, row in enumerate(reader, start=2):  # start=2 because of header
             try:
                 # Map CSV columns to lead fields
@@ -243,23 +300,23 @@ class LeadService:
                 if not lead_data["name"] or not lead_data["linkedin_url"]:
                     raise ValueError("name and linkedin_url are required")
                 
-                # Check for duplicates
-                existing = await self.lead_repo.get_by_linkedin_url(org_id, lead_data["linkedin_url"])
-                if existing:
+                # Duplicates within the file
+                if lead_data["linkedin_url"] in seen_urls:
                     raise ValueError("Duplicate LinkedIn URL")
+                seen_urls.add(lead_data["linkedin_url"])
                 
-                lead = await self.lead_repo.create(lead_data)
-                
-                # Calculate score
-                score = await self._calculate_score(org_id, lead)
-                if score > 0:
-                    await self.lead_repo.update_score(lead.id, score)
-                
-                imported += 1
+                batch.append((row_num, Lead(**lead_data)))
                 
             except Exception as e:
                 failed += 1
                 errors.append({"row": row_num, "error": str(e)})
+            
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush(batch)
+                batch = []
+        
+        if batch:
+            await flush(batch)
         
         # Log activity
         await self.activity_repo.log(
@@ -282,33 +339,36 @@ class LeadService:
         self,
         org_id: uuid.UUID,
         filters: Optional[LeadFilter] = None
-    ) -> str:
-        """Export leads to CSV format."""
-        leads = await self.lead_repo.export(org_id, filters)
-        
+    ) -> AsyncIterator[str]:
+        """
+        Export leads to CSV format, yielding one chunk of rows per cursor batch.
+        Runs on its own session: a streamed response outlives the request's session.
+        """
         output = io.StringIO()
-        fieldnames = [
-            "name", "linkedin_url", "email", "title", "company",
-            "location", "score", "status", "source", "created_at"
-        ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for lead in leads:
-            writer.writerow({
-                "name": lead.name,
-                "linkedin_url": lead.linkedin_url,
-                "email": lead.email,
-                "title": lead.title,
-                "company": lead.company,
-                "location": lead.location,
-                "score": lead.score,
-                "status": lead.status,
-                "source": lead.source,
-                "created_at": lead.created_at.isoformat()
-            })
-        
-        return output.getvalue()
+        writer = csv.writer(output)
+        writer.writerow(EXPORT_FIELDS)
+        yield output.getvalue()
+        
+        async with async_session_maker() as session:
+            async for leads in LeadRepository(session).stream_export(org_id, filters):
+                output.seek(0)
+                output.truncate()
+                writer.writerows(
+                    (
+                        lead.name,
+                        lead.linkedin_url,
+                        lead.email,
+                        lead.title,
+                        lead.company,
+                        lead.location,
+                        lead.score,
+                        lead.status,
+                        lead.source,
+                        lead.created_at.isoformat()
+                    )
+                    for lead in leads
+                )
+                yield output.getvalue()
     
     async def get_stats(self, org_id: uuid.UUID) -> dict:
         """Get lead statistics."""
@@ -317,69 +377,118 @@ class LeadService:
     async def _calculate_score(self, org_id: uuid.UUID, lead: Lead) -> int:
         """Calculate lead score based on rules."""
         rules = await self.scoring_repo.get_active(org_id)
-        
+        personas = await self.persona_repo.get_active(org_id)
+        return self._score_lead(lead, _compile_rules(rules), _compile_personas(personas))
+    
+    def _score_lead(self, lead: Lead, rules: List[tuple], personas: List[tuple]) -> int:
+        """Score a lead against rules and personas compiled by _compile_rules/_compile_personas."""
         score = 0
         for rule in rules:
             if self._evaluate_rule(lead, rule):
-                score += rule.score_delta
+                score += rule[4]
         
         # Also check persona matching
-        personas = await self.persona_repo.get_active(org_id)
+        title_lower = lead.title.lower() if lead.title else None
+        company_size = _parse_company_size(lead.company_size)
         for persona in personas:
-            if self._match_persona(lead, persona):
-                score += persona.score_bonus
+            if self._match_persona(title_lower, company_size, persona):
+                score += persona[3]
                 break  # Only match first persona
         
         return max(0, min(100, score))  # Clamp between 0-100
     
-    def _evaluate_rule(self, lead: Lead, rule) -> bool:
-        """Evaluate a single scoring rule against a lead."""
-        field_value = getattr(lead, rule.field, None)
+    def _evaluate_rule(self, lead: Lead, rule: tuple) -> bool:
+        """Evaluate a single compiled scoring rule against a lead."""
+        field, operator, value_lower, value_float, _ = rule
+        field_value = getattr(lead, field, None)
         
-        if rule.operator == "exists":
+        if operator == "exists":
             return field_value is not None and field_value != ""
-        elif rule.operator == "not_exists":
+        elif operator == "not_exists":
             return field_value is None or field_value == ""
-        elif rule.operator == "equals":
-            return str(field_value).lower() == rule.value.lower()
-        elif rule.operator == "contains":
-            return field_value and rule.value.lower() in str(field_value).lower()
-        elif rule.operator == "greater_than":
-            try:
-                return float(field_value or 0) > float(rule.value)
-            except:
+        elif operator == "equals":
+            return str(field_value).lower() == value_lower
+        elif operator == "contains":
+            return field_value and value_lower in str(field_value).lower()
+        elif operator in ("greater_than", "less_than"):
+            if value_float is None:
                 return False
-        elif rule.operator == "less_than":
             try:
-                return float(field_value or 0) < float(rule.value)
+                field_float = float(field_value or 0)
             except:
                 return False
+            if operator == "greater_than":
+                return field_float > value_float
+            return field_float < value_float
         
         return False
     
-    def _match_persona(self, lead: Lead, persona) -> bool:
-        """Check if lead matches persona rules."""
-        rules = persona.rules_json
+    def _match_persona(self, title_lower: Optional[str], company_size: Optional[int], persona: tuple) -> bool:
+        """Check if a lead's lowered title and parsed company size match compiled persona rules."""
+        title_keywords, title_exclude, company_size_min, _ = persona
         
         # Check title keywords
-        if "title_keywords" in rules and lead.title:
-            title_lower = lead.title.lower()
-            if not any(kw.lower() in title_lower for kw in rules["title_keywords"]):
+        if title_keywords is not None and title_lower:
+            if not any(kw in title_lower for kw in title_keywords):
                 return False
         
         # Check title exclusions
-        if "title_exclude" in rules and lead.title:
-            title_lower = lead.title.lower()
-            if any(ex.lower() in title_lower for ex in rules["title_exclude"]):
+        if title_exclude is not None and title_lower:
+            if any(ex in title_lower for ex in title_exclude):
                 return False
         
         # Check company size
-        if "company_size_min" in rules and lead.company_size:
+        if company_size_min is not None and company_size is not None:
             try:
-                size = int(lead.company_size.split("-")[0])
-                if size < rules["company_size_min"]:
+                if company_size < company_size_min:
                     return False
             except:
                 pass
         
         return True
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_company_size(company_size: Optional[str]) -> Optional[int]:
+    """Lower bound of a size range like "50-200", or None if absent/unparseable."""
+    if not company_size:
+        return None
+    try:
+        return int(company_size.split("-")[0])
+    except ValueError:
+        return None
+
+
+def _compile_rules(rules) -> List[tuple]:
+    """
+    Pre-process scoring rules once per scoring pass:
+    (field, operator, lowered value, numeric value or None, score_delta).
+    """
+    return [
+        (rule.field, rule.operator, rule.value.lower(), _to_float(rule.value), rule.score_delta)
+        for rule in rules
+    ]
+
+
+def _compile_personas(personas) -> List[tuple]:
+    """
+    Pre-process persona rules once per scoring pass:
+    (lowered title keywords, lowered title exclusions, company_size_min, score_bonus),
+    with None for checks the persona doesn't define.
+    """
+    compiled = []
+    for persona in personas:
+        rules = persona.rules_json
+        compiled.append((
+            tuple(kw.lower() for kw in rules["title_keywords"]) if "title_keywords" in rules else None,
+            tuple(ex.lower() for ex in rules["title_exclude"]) if "title_exclude" in rules else None,
+            rules.get("company_size_min"),
+            persona.score_bonus
+        ))
+    return compiled
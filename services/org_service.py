@@ -120,11 +120,13 @@ class OrganizationService:
 
     async def get_user_organizations(self, user_id: uuid.UUID) -> List[dict]:
         """Get all organizations user belongs to."""
-        memberships = await self.member_repo.get_user_memberships(user_id)
+        memberships = await self.member_repo.get_user_memberships(
+            user_id, with_organization=True
+        )
         
         result = []
         for membership in memberships:
-            org = await self.org_repo.get(membership.org_id)
+            org = membership.organization
             if org:
                 result.append({
                     "id": str(org.id),
@@ -192,11 +194,11 @@ class OrganizationService:
         if not is_member:
             raise_forbidden("You are not a member of this organization")
         
-        memberships = await self.member_repo.get_org_members(org_id)
+        memberships = await self.member_repo.get_org_members(org_id, with_user=True)
         
         result = []
         for membership in memberships:
-            member = await self.user_repo.get(membership.user_id)
+            member = membership.user
             if member:
                 result.append({
                     "id": str(membership.id),
@@ -249,7 +251,11 @@ class OrganizationService:
                 existing.role = role
                 self.session.add(existing)
                 await self.session.commit()
-                return {"message": f"User {invitee_email} re-added to organization"}
+                await self.user_repo.forget_cached(invitee.id)
+                return {
+                    "message": f"User {invitee_email} re-added to organization",
+                    "user_id": str(invitee.id)
+                }
         
         # Create membership
         membership = await self.member_repo.create_membership(
@@ -263,7 +269,8 @@ class OrganizationService:
         
         return {
             "message": f"User {invitee_email} invited to {org.name} as {role}",
-            "membership_id": str(membership.id)
+            "membership_id": str(membership.id),
+            "user_id": str(invitee.id)
         }
     
     async def update_member_role(
@@ -70,9 +70,16 @@ class OutreachService:
         lead_id: Optional[uuid.UUID] = None,
         status: Optional[str] = None,
         page: int = 1,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None
     ) -> dict:
-        """List outreach messages with filters."""
+        """
+        List outreach messages with filters.
+        With a cursor, pages by keyset; page is kept for older clients.
+        """
+        if cursor is not None:
+            return await self.message_repo.list_after(org_id, cursor, limit, lead_id, status)
+        
         if lead_id:
             return await self.message_repo.get_by_lead(org_id, lead_id, page, limit)
         
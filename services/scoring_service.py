@@ -47,6 +47,10 @@ class ScoringService:
             return await self.scoring_repo.get_active(org_id)
         return await self.scoring_repo.list(org_id)
     
+    async def list_rules_as_dicts(self, org_id: uuid.UUID, active_only: bool = True) -> List[dict]:
+        """List scoring rules as plain dicts, ready for direct serialization."""
+        return await self.scoring_repo.list_as_dicts(org_id, active_only)
+    
     async def update_rule(
         self,
         org_id: uuid.UUID,
@@ -101,14 +105,13 @@ class ScoringService:
         total_before = sum(l.score for l in leads)
         avg_before = total_before / len(leads)
         
-        total_after = 0
-        rules = await self.scoring_repo.get_active(org_id) # Keep rules for custom overrides if needed, but primary is weighted
-
+        scores = []
         for lead in leads:
             new_score = await self.calculate_score(org_id, lead)
-            
-            await self.lead_repo.update_score(lead.id, new_score)
-            total_after += new_score
+            scores.append({"id": lead.id, "score": new_score})
+        
+        await self.lead_repo.update_scores(scores)
+        total_after = sum(row["score"] for row in scores)
             
         avg_after = total_after / len(leads)
         
@@ -252,13 +255,7 @@ class ScoringService:
     ) -> RecalculateResponse:
         """Recalculate scores for all or specific leads."""
         if lead_ids:
-            # Helper to fetch specific leads - efficient implementation requires repo support or loop
-            # For simplicity using loop here as list defaults to all
-             leads = []
-             for lid in lead_ids:
-                 l = await self.lead_repo.get(lid)
-                 if l and l.org_id == org_id:
-                     leads.append(l)
+            leads = await self.lead_repo.get_many(org_id, lead_ids)
         else:
              # Get all leads (limit 1000 for safety in MVP)
              leads_dict = await self.lead_repo.search(org_id, limit=1000)
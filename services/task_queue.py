@@ -0,0 +1,89 @@
+"""
+Enrichment task queue (FastStream over Redis).
+API processes publish jobs; dedicated workers consume them:
+
+    ENRICH_WORKER_SHARD=<n> faststream run backend.services.task_queue:app
+
+Jobs are partitioned by lead id into ENRICH_SHARDS Redis lists and each
+worker consumes exactly one, so no two workers ever enrich the same lead and
+workers never contend for the same rows. Lists (not pub/sub channels) hold
+jobs until a worker pops them, so nothing is lost while a shard's worker is
+down or restarting.
+
+Only active when REDIS_URL is configured; otherwise `broker` is None and
+callers fall back to FastAPI BackgroundTasks.
+"""
+import uuid
+from collections import defaultdict
+from typing import List
+
+from pydantic import BaseModel
+
+from backend.config import settings
+
+
+ENRICH_SINGLE = "enrich.single"
+ENRICH_BULK = "enrich.bulk"
+
+
+class EnrichLeadMessage(BaseModel):
+    lead_id: uuid.UUID
+
+
+class BulkEnrichMessage(BaseModel):
+    lead_ids: List[uuid.UUID]
+
+
+def shard_for(lead_id: uuid.UUID) -> int:
+    """Stable shard of a lead (same in every process, unlike hash() on str)."""
+    return lead_id.int % settings.ENRICH_SHARDS
+
+
+def _channel(base: str, shard: int) -> str:
+    return f"{base}.{shard}"
+
+
+async def publish_enrich_lead(lead_id: uuid.UUID) -> None:
+    """Queue a single-lead enrichment on the lead's shard."""
+    await broker.publish(
+        EnrichLeadMessage(lead_id=lead_id),
+        list=_channel(ENRICH_SINGLE, shard_for(lead_id))
+    )
+
+
+async def publish_bulk_enrich(lead_ids: List[uuid.UUID]) -> None:
+    """Queue a bulk enrichment, split into one message per shard."""
+    by_shard = defaultdict(list)
+    for lead_id in lead_ids:
+        by_shard[shard_for(lead_id)].append(lead_id)
+    for shard, shard_ids in by_shard.items():
+        await broker.publish(
+            BulkEnrichMessage(lead_ids=shard_ids),
+            list=_channel(ENRICH_BULK, shard)
+        )
+
+
+broker = None
+app = None
+
+if settings.REDIS_URL:
+    from faststream import FastStream
+    from faststream.redis import RedisBroker
+
+    broker = RedisBroker(settings.REDIS_URL)
+    app = FastStream(broker)
+
+    @broker.subscriber(list=_channel(ENRICH_SINGLE, settings.ENRICH_WORKER_SHARD))
+    async def handle_enrich_lead(message: EnrichLeadMessage):
+        from backend.api.enrichment import _enrich_lead_task
+        await _enrich_lead_task(message.lead_id)
+
+    @broker.subscriber(list=_channel(ENRICH_BULK, settings.ENRICH_WORKER_SHARD))
+    async def handle_bulk_enrich(message: BulkEnrichMessage):
+        from backend.api.enrichment import _bulk_enrich_task
+        await _bulk_enrich_task(message.lead_ids)
+
+    @app.after_shutdown
+    async def close_clients():
+        from backend.services.apollo_service import apollo_service
+        await apollo_service.close()